@@ -13,8 +13,7 @@ import os
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy import select
 import bcrypt
 
@@ -33,7 +32,7 @@ async def create_admin_user():
     # Create async engine - use the same database as import
     db_url = "sqlite+aiosqlite:///./uns_rirekisho_prod.db"
     engine = create_async_engine(db_url, echo=True)
-    async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async_session = async_sessionmaker(engine, expire_on_commit=False, autoflush=False)
 
     async with async_session() as session:
         # Check if admin already exists
@@ -15,8 +15,7 @@ from datetime import datetime
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy import select
 
 from app.core.config import settings
@@ -279,7 +278,7 @@ async def main():
         await conn.run_sync(Base.metadata.create_all)
 
     # Create session
-    async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async_session = async_sessionmaker(engine, expire_on_commit=False, autoflush=False)
 
     data_path = Path(__file__).parent.parent / "exports"
 
@@ -13,9 +13,13 @@ Tables to import:
 
 import os
 import sys
+import math
 import sqlite3
+from concurrent.futures import ThreadPoolExecutor, wait
 from datetime import datetime, date
 from decimal import Decimal
+from functools import lru_cache
+from operator import itemgetter
 import re
 
 # Add backend to path
@@ -35,6 +39,125 @@ PHOTOS_DIR = r"C:\Users\Jpkken\UNSRireki-Prov26.1.4\backend\uploads\photos"
 # Ensure photos directory exists
 os.makedirs(PHOTOS_DIR, exist_ok=True)
 
+# Access columns actually read by each import (avoids SELECT * over wide tables)
+CANDIDATE_COLUMNS = (
+    '履歴書ID', '氏名', 'フリガナ', '氏名（ローマ字）', '性別', '国籍', '生年月日',
+    '配偶者', '郵便番号', '現住所', '建物名', '電話番号', '携帯電話', '電子メール',
+    '在留資格', '（在留カード記載）在留期限', '在留カード番号', 'パスポート番号',
+    'パスポート期限', '身長', '体重', '靴のサイズ', 'ウエスト', '服サイズ', '血液型',
+    '視力　右', '視力　左', '眼鏡使用', '利き腕', '緊急連絡先　氏名',
+    '緊急連絡先　続柄', '緊急連絡先　電話番号', '日本語能力試験Level', '聞く', '話す',
+    '読む　カナ', '書く　カナ', '最終学歴', '専攻', '志望動機', '趣味・特技', '備考',
+)
+
+# Tables whose secondary indexes are dropped during the bulk load
+BULK_LOAD_TABLES = ("candidates", "employees", "haken_assignments", "ukeoi_assignments")
+
+# Attachment subfields read alongside the candidate columns
+PHOTO_SELECT = ('[写真].FileData AS photo_data', '[写真].FileName AS photo_name')
+NO_PHOTO_SELECT = ('NULL AS photo_data', 'NULL AS photo_name')
+
+EMPLOYEE_COLUMNS = (
+    '現在', '事務所', '氏名', 'カナ', '性別', '国籍', '生年月日', 'ビザ期限',
+    'ビザ種類', '配偶者', '〒', '住所', '建物名', '入社日', '退社日',
+)
+
+HAKEN_COLUMNS = EMPLOYEE_COLUMNS + (
+    '派遣先', '配属先', '配属ライン', '仕事内容', '時給', '時給改定', '請求単価',
+    '請求改定', '差額利益', '標準報酬', '健康保険', '介護保険', '厚生年金', '社保加入',
+    'ｱﾊﾟｰﾄ', '入居', '退去', '現入社', 'ｱﾗｰﾄ(ﾋﾞｻﾞ更新)', '免許種類', '免許期限',
+    '通勤方法', '任意保険期限', '日本語検定', 'キャリアアップ5年目', '入社依頼', '備考',
+)
+
+UKEOI_COLUMNS = EMPLOYEE_COLUMNS + (
+    '請負業務', '時給', '時給改定', '差額利益', '標準報酬', '健康保険', '介護保険',
+    '厚生年金', '社保加入', '通勤距離', '交通費', 'ｱﾊﾟｰﾄ', '入居', '退去',
+    'ｱﾗｰﾄ(ﾋﾞｻﾞ更新)', '口座名義', '銀行名', '支店番号', '支店名', '口座番号',
+    '入社依頼', '備考',
+)
+
+# SQLite insert columns; values are pulled from each data dict in this order
+CANDIDATE_FIELDS = (
+    'legacy_id', 'full_name', 'name_kana', 'name_romanji', 'gender',
+    'nationality', 'birth_date', 'marital_status', 'postal_code', 'address',
+    'building_name', 'phone', 'mobile', 'email', 'visa_type', 'visa_expiry',
+    'residence_card_number', 'passport_number', 'passport_expiry', 'height',
+    'weight', 'shoe_size', 'waist', 'uniform_size', 'blood_type',
+    'vision_right', 'vision_left', 'wears_glasses', 'dominant_hand',
+    'emergency_contact_name', 'emergency_contact_relation',
+    'emergency_contact_phone', 'japanese_level', 'listening_level',
+    'speaking_level', 'reading_level', 'writing_level', 'education_level',
+    'major', 'reason_for_applying', 'self_pr', 'notes', 'photo_url', 'status',
+    'created_at',
+)
+
+EMPLOYEE_FIELDS = (
+    'employee_number', 'status', 'office', 'full_name', 'name_kana', 'gender',
+    'nationality', 'birth_date', 'visa_expiry', 'visa_type', 'has_spouse',
+    'postal_code', 'address', 'building_name', 'hire_date', 'termination_date',
+    'employment_type', 'created_at',
+)
+
+HAKEN_FIELDS = (
+    'employee_id', 'status', 'client_company', 'assignment_location',
+    'assignment_line', 'job_description', 'hourly_rate', 'hourly_rate_history',
+    'billing_rate', 'billing_rate_history', 'profit_margin', 'standard_salary',
+    'health_insurance', 'nursing_insurance', 'pension',
+    'social_insurance_enrolled', 'apartment_name', 'move_in_date',
+    'move_out_date', 'start_date', 'end_date', 'current_hire_date',
+    'visa_alert', 'license_type', 'license_expiry', 'commute_method',
+    'optional_insurance_expiry', 'japanese_certification',
+    'career_up_5th_year', 'entry_request', 'notes', 'created_at',
+)
+
+UKEOI_FIELDS = (
+    'employee_id', 'status', 'job_type', 'hourly_rate', 'hourly_rate_history',
+    'profit_margin', 'standard_salary', 'health_insurance',
+    'nursing_insurance', 'pension', 'social_insurance_enrolled',
+    'commute_distance', 'transport_allowance', 'apartment_name',
+    'move_in_date', 'move_out_date', 'start_date', 'end_date', 'visa_alert',
+    'bank_account_name', 'bank_name', 'branch_number', 'branch_name',
+    'account_number', 'entry_request', 'notes', 'created_at',
+)
+
+
+def insert_sql(table, fields):
+    """Build a parameterized INSERT statement for a fixed column order."""
+    return f"INSERT INTO {table} ({', '.join(fields)}) VALUES ({', '.join('?' * len(fields))})"
+
+
+# SQLite raised its bound-parameter limit from 999 to 32766 in 3.32
+SQLITE_MAX_VARIABLES = 32766 if sqlite3.sqlite_version_info >= (3, 32, 0) else 999
+
+
+@lru_cache(maxsize=None)
+def multi_insert_sql(table, fields, row_count):
+    """Build a single INSERT with row_count VALUES tuples."""
+    row = f"({', '.join('?' * len(fields))})"
+    return f"INSERT INTO {table} ({', '.join(fields)}) VALUES {', '.join([row] * row_count)}"
+
+
+def insert_many(cursor, table, fields, rows):
+    """Insert rows with multi-row VALUES statements within the parameter limit."""
+    step = max(1, SQLITE_MAX_VARIABLES // len(fields))
+    for start in range(0, len(rows), step):
+        chunk = rows[start:start + step]
+        cursor.execute(
+            multi_insert_sql(table, fields, len(chunk)),
+            [value for values in chunk for value in values]
+        )
+
+
+INSERT_CANDIDATES_SQL = insert_sql("candidates", CANDIDATE_FIELDS)
+INSERT_EMPLOYEES_SQL = insert_sql("employees", EMPLOYEE_FIELDS)
+INSERT_HAKEN_SQL = insert_sql("haken_assignments", HAKEN_FIELDS)
+INSERT_UKEOI_SQL = insert_sql("ukeoi_assignments", UKEOI_FIELDS)
+
+candidate_values = itemgetter(*CANDIDATE_FIELDS)
+employee_values = itemgetter(*EMPLOYEE_FIELDS)
+haken_values = itemgetter(*HAKEN_FIELDS)
+ukeoi_values = itemgetter(*UKEOI_FIELDS)
+
 
 def connect_access():
     """Connect to Access database."""
@@ -91,14 +214,67 @@ def clear_sqlite_data(sqlite_conn):
     print("Data cleared successfully.")
 
 
+def build_select(access_cursor, table, wanted, order_by=None, extra=()):
+    """Build a SELECT for the wanted columns of an Access table.
+
+    Columns missing from the table are selected as NULL, so every wanted
+    column is present in the result and can be indexed by position.
+    ``extra`` holds raw select expressions appended as-is.
+    """
+    access_cursor.execute(f"SELECT * FROM {table} WHERE 1=0")
+    available = {desc[0] for desc in access_cursor.description}
+    selected = [
+        f"[{col}]" if col in available else f"NULL AS [{col}]"
+        for col in dict.fromkeys(wanted)
+    ]
+    selected.extend(extra)
+    query = f"SELECT {', '.join(selected)} FROM {table}"
+    if order_by:
+        query += f" ORDER BY {order_by}"
+    return query
+
+
+def drop_indexes(sqlite_conn):
+    """Drop non-unique secondary indexes on the import tables and return their DDL.
+
+    Unique indexes stay in place: the import relies on them to reject
+    duplicate legacy ids and employee numbers.
+    """
+    cursor = sqlite_conn.cursor()
+    cursor.execute(
+        "SELECT name, sql FROM sqlite_master "
+        "WHERE type = 'index' AND sql IS NOT NULL AND sql NOT LIKE 'CREATE UNIQUE%' "
+        "AND tbl_name IN (?, ?, ?, ?)",
+        BULK_LOAD_TABLES
+    )
+    saved = cursor.fetchall()
+    for name, _ in saved:
+        cursor.execute(f'DROP INDEX IF EXISTS "{name}"')
+    sqlite_conn.commit()
+    print(f"Dropped {len(saved)} indexes for bulk load")
+    return [sql for _, sql in saved]
+
+
+def restore_indexes(sqlite_conn, index_sql):
+    """Recreate indexes saved by drop_indexes."""
+    cursor = sqlite_conn.cursor()
+    for sql in index_sql:
+        cursor.execute(sql)
+    sqlite_conn.commit()
+    print(f"Recreated {len(index_sql)} indexes")
+
+
 def safe_str(val, max_len=None):
     """Safely convert value to string."""
     if val is None:
         return None
-    s = str(val).strip()
-    if max_len and len(s) > max_len:
-        s = s[:max_len]
-    return s if s else None
+    s = (val if type(val) is str else str(val)).strip()
+    return (s[:max_len] if max_len and len(s) > max_len else s) or None
+
+
+def safe_bool(val):
+    """Convert a truthy flag to True; falsy or missing values become None."""
+    return True if val else None
 
 
 def safe_date(val):
@@ -116,9 +292,19 @@ def safe_int(val):
     """Safely convert to integer."""
     if val is None:
         return None
+    if isinstance(val, int):
+        return val
+    if isinstance(val, float):
+        return int(val) if math.isfinite(val) else None
+    if isinstance(val, Decimal):
+        return int(val) if val.is_finite() else None
+    if isinstance(val, str):
+        s = val.strip()
+        digits = s[1:] if s[:1] in ('+', '-') else s
+        return int(s) if digits.isdecimal() else None
     try:
         return int(val)
-    except:
+    except (TypeError, ValueError):
         return None
 
 
@@ -128,10 +314,34 @@ def safe_float(val):
         return None
     try:
         return float(val)
-    except:
+    except (TypeError, ValueError, OverflowError):
         return None
 
 
+def _write_photo(photo_path, file_data):
+    """Write photo bytes to disk (runs on the I/O pool).
+
+    Returns False without writing when the file on disk is already identical.
+    """
+    try:
+        if os.path.getsize(photo_path) == len(file_data):
+            with open(photo_path, 'rb') as f:
+                if f.read() == file_data:
+                    return False
+    except OSError:
+        pass
+
+    fd = os.open(photo_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0))
+    try:
+        view = memoryview(file_data)
+        while view:
+            written = os.write(fd, view)
+            view = view[written:]
+    finally:
+        os.close(fd)
+    return True
+
+
 def import_candidates(access_conn, sqlite_conn):
     """Import candidates from T_履歴書 with photos."""
     print("\n" + "="*60)
@@ -140,201 +350,176 @@ def import_candidates(access_conn, sqlite_conn):
 
     access_cursor = access_conn.cursor()
     sqlite_cursor = sqlite_conn.cursor()
+    now_iso = datetime.now().isoformat()  # One timestamp for the whole batch
 
-    # Get column names from T_履歴書
-    access_cursor.execute("SELECT TOP 1 * FROM T_履歴書")
+    # Query only the columns that are mapped below, with the photo attachment
+    try:
+        access_cursor.execute(build_select(
+            access_cursor, "T_履歴書", CANDIDATE_COLUMNS,
+            order_by="履歴書ID", extra=PHOTO_SELECT,
+        ))
+    except Exception as e:
+        print(f"  Error querying photo attachment: {e}")
+        print("  Importing candidates without photos...")
+        access_cursor.execute(build_select(
+            access_cursor, "T_履歴書", CANDIDATE_COLUMNS,
+            order_by="履歴書ID", extra=NO_PHOTO_SELECT,
+        ))
     columns = [desc[0] for desc in access_cursor.description]
-    print(f"Available columns: {len(columns)}")
+    print(f"Selected columns: {len(columns)}")
 
     # Build column index map
     col_idx = {col: i for i, col in enumerate(columns)}
     print(f"Column index built with {len(col_idx)} columns")
 
-    # Query all candidates using SELECT *
-    access_cursor.execute("SELECT * FROM T_履歴書 ORDER BY 履歴書ID")
     rows = access_cursor.fetchall()
     print(f"Found {len(rows)} candidates to import")
 
     imported = 0
-    photos_imported = 0
-
-    # Helper to get value by column name
-    def get_col(row, col_name, default=None):
-        if col_name in col_idx:
-            return row[col_idx[col_name]]
-        return default
+    batch = []
+    seen_ids = set()
+
+    # Photo files are independent, so writes go to a thread pool while the
+    # main thread keeps building rows; photo_url goes straight into the INSERT.
+    io_pool = ThreadPoolExecutor(max_workers=8)
+    futures = []
+    photo_ids = []
+
+    def queue_photo(legacy_id, file_data, file_name):
+        """Submit a photo write and return its URL."""
+        # Determine extension
+        ext = '.jpg'
+        if file_name:
+            _, ext = os.path.splitext(file_name)
+            ext = ext.lower() or '.jpg'
+
+        # Save photo
+        photo_filename = f"{legacy_id}{ext}"
+        photo_path = os.path.join(PHOTOS_DIR, photo_filename)
+        futures.append(io_pool.submit(_write_photo, photo_path, file_data))
+        photo_ids.append(legacy_id)
+        return f"/uploads/photos/{photo_filename}"
+
+    def flush_batch():
+        """Insert pending candidates; on failure retry row by row."""
+        nonlocal imported
+        sqlite_cursor.execute("SAVEPOINT candidate_batch")
+        try:
+            insert_many(sqlite_cursor, "candidates", CANDIDATE_FIELDS, batch)
+            imported += len(batch)
+        except sqlite3.Error:
+            sqlite_cursor.execute("ROLLBACK TO candidate_batch")
+            for values in batch:
+                try:
+                    sqlite_cursor.execute(INSERT_CANDIDATES_SQL, values)
+                    imported += 1
+                except sqlite3.Error as e:
+                    print(f"  Error importing candidate {values[0]}: {e}")
+        sqlite_cursor.execute("RELEASE candidate_batch")
+        sqlite_conn.commit()
+        batch.clear()
+        print(f"  Imported {imported} candidates...")
+
+    photo_data_idx = col_idx['photo_data']
+    photo_name_idx = col_idx['photo_name']
 
     for row in rows:
         try:
-            # Create dict from row using column names
-            row_dict = dict(zip(columns, row))
-
-            legacy_id = row_dict.get('履歴書ID')
-            if not legacy_id:
+            legacy_id = row[col_idx['履歴書ID']]
+            # Attachment fields yield one row per file; keep the first
+            if not legacy_id or legacy_id in seen_ids:
                 continue
+            seen_ids.add(legacy_id)
+
+            file_data = row[photo_data_idx]
+            photo_url = queue_photo(legacy_id, file_data, row[photo_name_idx]) if file_data else None
 
             # Map fields to SQLite columns
             data = {
                 'legacy_id': legacy_id,
-                'full_name': safe_str(row_dict.get('氏名'), 100) or f"Unknown_{legacy_id}",
-                'name_kana': safe_str(row_dict.get('フリガナ'), 100),
-                'name_romanji': safe_str(row_dict.get('氏名（ローマ字）'), 100),
-                'gender': safe_str(row_dict.get('性別'), 10),
-                'nationality': safe_str(row_dict.get('国籍'), 50),
-                'birth_date': safe_date(row_dict.get('生年月日')),
-                'marital_status': safe_str(row_dict.get('配偶者'), 20),
-                'postal_code': safe_str(row_dict.get('郵便番号'), 10),
-                'address': safe_str(row_dict.get('現住所')),
-                'building_name': safe_str(row_dict.get('建物名'), 100),
-                'phone': safe_str(row_dict.get('電話番号'), 20),
-                'mobile': safe_str(row_dict.get('携帯電話'), 20),
-                'email': safe_str(row_dict.get('電子メール'), 100),
-                'visa_type': safe_str(row_dict.get('在留資格'), 100),
-                'visa_expiry': safe_date(row_dict.get('（在留カード記載）在留期限')),
-                'residence_card_number': safe_str(row_dict.get('在留カード番号'), 50),
-                'passport_number': safe_str(row_dict.get('パスポート番号'), 50),
-                'passport_expiry': safe_date(row_dict.get('パスポート期限')),
-                'height': safe_float(row_dict.get('身長')),
-                'weight': safe_float(row_dict.get('体重')),
-                'shoe_size': safe_float(row_dict.get('靴のサイズ')),
-                'waist': safe_int(row_dict.get('ウエスト')),
-                'uniform_size': safe_str(row_dict.get('服サイズ'), 10),
-                'blood_type': safe_str(row_dict.get('血液型'), 5),
-                'vision_right': safe_float(row_dict.get('視力　右')),
-                'vision_left': safe_float(row_dict.get('視力　左')),
-                'wears_glasses': bool(row_dict.get('眼鏡使用')) if row_dict.get('眼鏡使用') else None,
-                'dominant_hand': safe_str(row_dict.get('利き腕'), 10),
-                'emergency_contact_name': safe_str(row_dict.get('緊急連絡先　氏名'), 100),
-                'emergency_contact_relation': safe_str(row_dict.get('緊急連絡先　続柄'), 50),
-                'emergency_contact_phone': safe_str(row_dict.get('緊急連絡先　電話番号'), 20),
-                'japanese_level': safe_str(row_dict.get('日本語能力試験Level'), 20),
-                'listening_level': safe_str(row_dict.get('聞く'), 20),
-                'speaking_level': safe_str(row_dict.get('話す'), 20),
-                'reading_level': safe_str(row_dict.get('読む　カナ'), 20),
-                'writing_level': safe_str(row_dict.get('書く　カナ'), 20),
-                'education_level': safe_str(row_dict.get('最終学歴'), 50),
-                'major': safe_str(row_dict.get('専攻'), 100),
-                'reason_for_applying': safe_str(row_dict.get('志望動機')),
-                'self_pr': safe_str(row_dict.get('趣味・特技')),
-                'notes': safe_str(row_dict.get('備考')),
+                'full_name': safe_str(row[col_idx['氏名']], 100) or f"Unknown_{legacy_id}",
+                'name_kana': safe_str(row[col_idx['フリガナ']], 100),
+                'name_romanji': safe_str(row[col_idx['氏名（ローマ字）']], 100),
+                'gender': safe_str(row[col_idx['性別']], 10),
+                'nationality': safe_str(row[col_idx['国籍']], 50),
+                'birth_date': safe_date(row[col_idx['生年月日']]),
+                'marital_status': safe_str(row[col_idx['配偶者']], 20),
+                'postal_code': safe_str(row[col_idx['郵便番号']], 10),
+                'address': safe_str(row[col_idx['現住所']]),
+                'building_name': safe_str(row[col_idx['建物名']], 100),
+                'phone': safe_str(row[col_idx['電話番号']], 20),
+                'mobile': safe_str(row[col_idx['携帯電話']], 20),
+                'email': safe_str(row[col_idx['電子メール']], 100),
+                'visa_type': safe_str(row[col_idx['在留資格']], 100),
+                'visa_expiry': safe_date(row[col_idx['（在留カード記載）在留期限']]),
+                'residence_card_number': safe_str(row[col_idx['在留カード番号']], 50),
+                'passport_number': safe_str(row[col_idx['パスポート番号']], 50),
+                'passport_expiry': safe_date(row[col_idx['パスポート期限']]),
+                'height': safe_float(row[col_idx['身長']]),
+                'weight': safe_float(row[col_idx['体重']]),
+                'shoe_size': safe_float(row[col_idx['靴のサイズ']]),
+                'waist': safe_int(row[col_idx['ウエスト']]),
+                'uniform_size': safe_str(row[col_idx['服サイズ']], 10),
+                'blood_type': safe_str(row[col_idx['血液型']], 5),
+                'vision_right': safe_float(row[col_idx['視力　右']]),
+                'vision_left': safe_float(row[col_idx['視力　左']]),
+                'wears_glasses': safe_bool(row[col_idx['眼鏡使用']]),
+                'dominant_hand': safe_str(row[col_idx['利き腕']], 10),
+                'emergency_contact_name': safe_str(row[col_idx['緊急連絡先　氏名']], 100),
+                'emergency_contact_relation': safe_str(row[col_idx['緊急連絡先　続柄']], 50),
+                'emergency_contact_phone': safe_str(row[col_idx['緊急連絡先　電話番号']], 20),
+                'japanese_level': safe_str(row[col_idx['日本語能力試験Level']], 20),
+                'listening_level': safe_str(row[col_idx['聞く']], 20),
+                'speaking_level': safe_str(row[col_idx['話す']], 20),
+                'reading_level': safe_str(row[col_idx['読む　カナ']], 20),
+                'writing_level': safe_str(row[col_idx['書く　カナ']], 20),
+                'education_level': safe_str(row[col_idx['最終学歴']], 50),
+                'major': safe_str(row[col_idx['専攻']], 100),
+                'reason_for_applying': safe_str(row[col_idx['志望動機']]),
+                'self_pr': safe_str(row[col_idx['趣味・特技']]),
+                'notes': safe_str(row[col_idx['備考']]),
+                'photo_url': photo_url,
                 'status': 'registered',
-                'created_at': datetime.now().isoformat(),
+                'created_at': now_iso,
             }
 
-            # Insert candidate
-            columns_str = ', '.join(data.keys())
-            placeholders = ', '.join(['?' for _ in data])
-            sqlite_cursor.execute(
-                f"INSERT INTO candidates ({columns_str}) VALUES ({placeholders})",
-                list(data.values())
-            )
-            candidate_id = sqlite_cursor.lastrowid
-            imported += 1
-
-            if imported % 100 == 0:
-                print(f"  Imported {imported} candidates...")
-                sqlite_conn.commit()
+            # Queue candidate for the next batch insert
+            batch.append(candidate_values(data))
+            if len(batch) >= 500:
+                flush_batch()
 
         except Exception as e:
             print(f"  Error importing candidate {legacy_id}: {e}")
             continue
 
+    if batch:
+        flush_batch()
     sqlite_conn.commit()
     print(f"Imported {imported} candidates")
 
-    # Now import photos separately using attachment subfield syntax
-    print("\nImporting photos from attachment field...")
-
-    photo_query = "SELECT 履歴書ID, 写真.FileData, 写真.FileName FROM T_履歴書 WHERE 写真.FileName IS NOT NULL"
-
-    try:
-        access_cursor.execute(photo_query)
-        photo_rows = access_cursor.fetchall()
-        print(f"Found {len(photo_rows)} photos to import")
-
-        for photo_row in photo_rows:
-            try:
-                legacy_id = photo_row[0]
-                file_data = photo_row[1]
-                file_name = photo_row[2]
-
-                if file_data and len(file_data) > 0:
-                    # Determine extension
-                    ext = '.jpg'
-                    if file_name:
-                        _, ext = os.path.splitext(file_name)
-                        ext = ext.lower() or '.jpg'
-
-                    # Save photo
-                    photo_filename = f"{legacy_id}{ext}"
-                    photo_path = os.path.join(PHOTOS_DIR, photo_filename)
-
-                    with open(photo_path, 'wb') as f:
-                        f.write(file_data)
-
-                    # Update candidate with photo_url
-                    photo_url = f"/uploads/photos/{photo_filename}"
-                    sqlite_cursor.execute(
-                        "UPDATE candidates SET photo_url = ? WHERE legacy_id = ?",
-                        (photo_url, legacy_id)
-                    )
-                    photos_imported += 1
-
-                    if photos_imported % 100 == 0:
-                        print(f"  Imported {photos_imported} photos...")
-                        sqlite_conn.commit()
-
-            except Exception as e:
-                print(f"  Error importing photo for {legacy_id}: {e}")
-                continue
-
-    except Exception as e:
-        print(f"  Error querying photos: {e}")
-        print("  Trying alternative photo query...")
-
-        # Alternative: query one by one
-        sqlite_cursor.execute("SELECT legacy_id FROM candidates")
-        all_legacy_ids = [r[0] for r in sqlite_cursor.fetchall()]
-
-        for legacy_id in all_legacy_ids:
-            try:
-                access_cursor.execute(
-                    "SELECT 写真.FileData, 写真.FileName FROM T_履歴書 WHERE 履歴書ID = ?",
-                    (legacy_id,)
-                )
-                photo_row = access_cursor.fetchone()
-
-                if photo_row and photo_row[0]:
-                    file_data = photo_row[0]
-                    file_name = photo_row[1]
-
-                    ext = '.jpg'
-                    if file_name:
-                        _, ext = os.path.splitext(file_name)
-                        ext = ext.lower() or '.jpg'
-
-                    photo_filename = f"{legacy_id}{ext}"
-                    photo_path = os.path.join(PHOTOS_DIR, photo_filename)
-
-                    with open(photo_path, 'wb') as f:
-                        f.write(file_data)
-
-                    photo_url = f"/uploads/photos/{photo_filename}"
-                    sqlite_cursor.execute(
-                        "UPDATE candidates SET photo_url = ? WHERE legacy_id = ?",
-                        (photo_url, legacy_id)
-                    )
-                    photos_imported += 1
-
-                    if photos_imported % 100 == 0:
-                        print(f"  Imported {photos_imported} photos...")
-                        sqlite_conn.commit()
-
-            except Exception as e:
-                # Skip silently for individual errors
-                continue
-
-    sqlite_conn.commit()
+    # Wait for all writes; unlink candidates whose photo never reached disk
+    wait(futures)
+    io_pool.shutdown()
+    failed_ids = []
+    unchanged = 0
+    for future, legacy_id in zip(futures, photo_ids):
+        error = future.exception()
+        if error:
+            print(f"  Error writing photo for {legacy_id}: {error}")
+            failed_ids.append((legacy_id,))
+        elif not future.result():
+            unchanged += 1
+    if unchanged:
+        print(f"  Skipped {unchanged} unchanged photo files")
+
+    if failed_ids:
+        sqlite_cursor.executemany(
+            "UPDATE candidates SET photo_url = NULL WHERE legacy_id = ?",
+            failed_ids
+        )
+        sqlite_conn.commit()
+
+    photos_imported = len(futures) - len(failed_ids)
     print(f"Imported {photos_imported} photos")
 
     return imported, photos_imported
@@ -348,15 +533,17 @@ def import_employees_from_dbstaffx(access_conn, sqlite_conn, employee_number_sta
 
     access_cursor = access_conn.cursor()
     sqlite_cursor = sqlite_conn.cursor()
+    now_iso = datetime.now().isoformat()  # One timestamp for the whole batch
 
     try:
-        access_cursor.execute("SELECT * FROM DBStaffX")
+        access_cursor.execute(build_select(access_cursor, "DBStaffX", EMPLOYEE_COLUMNS))
         columns = [desc[0] for desc in access_cursor.description]
         print(f"DBStaffX columns: {columns}")
     except Exception as e:
         print(f"Error: Could not access DBStaffX: {e}")
         return 0, employee_number_start
 
+    col_idx = {col: i for i, col in enumerate(columns)}
     rows = access_cursor.fetchall()
     print(f"Found {len(rows)} direct staff records")
 
@@ -365,36 +552,28 @@ def import_employees_from_dbstaffx(access_conn, sqlite_conn, employee_number_sta
 
     for row in rows:
         try:
-            # Map DBStaffX columns (adjust indices based on actual column order)
-            row_dict = dict(zip(columns, row))
-
             employee_data = {
                 'employee_number': emp_num,
-                'status': safe_str(row_dict.get('現在', '在職中'), 20) or '在職中',
-                'office': safe_str(row_dict.get('事務所'), 50),
-                'full_name': safe_str(row_dict.get('氏名'), 100) or f"Staff_{emp_num}",
-                'name_kana': safe_str(row_dict.get('カナ'), 100),
-                'gender': safe_str(row_dict.get('性別'), 10),
-                'nationality': safe_str(row_dict.get('国籍'), 50),
-                'birth_date': safe_date(row_dict.get('生年月日')),
-                'visa_expiry': safe_date(row_dict.get('ビザ期限')),
-                'visa_type': safe_str(row_dict.get('ビザ種類'), 100),
-                'has_spouse': bool(row_dict.get('配偶者')) if row_dict.get('配偶者') else None,
-                'postal_code': safe_str(row_dict.get('〒'), 10),
-                'address': safe_str(row_dict.get('住所')),
-                'building_name': safe_str(row_dict.get('建物名'), 100),
-                'hire_date': safe_date(row_dict.get('入社日')),
-                'termination_date': safe_date(row_dict.get('退社日')),
+                'status': safe_str(row[col_idx['現在']], 20) or '在職中',
+                'office': safe_str(row[col_idx['事務所']], 50),
+                'full_name': safe_str(row[col_idx['氏名']], 100) or f"Staff_{emp_num}",
+                'name_kana': safe_str(row[col_idx['カナ']], 100),
+                'gender': safe_str(row[col_idx['性別']], 10),
+                'nationality': safe_str(row[col_idx['国籍']], 50),
+                'birth_date': safe_date(row[col_idx['生年月日']]),
+                'visa_expiry': safe_date(row[col_idx['ビザ期限']]),
+                'visa_type': safe_str(row[col_idx['ビザ種類']], 100),
+                'has_spouse': safe_bool(row[col_idx['配偶者']]),
+                'postal_code': safe_str(row[col_idx['〒']], 10),
+                'address': safe_str(row[col_idx['住所']]),
+                'building_name': safe_str(row[col_idx['建物名']], 100),
+                'hire_date': safe_date(row[col_idx['入社日']]),
+                'termination_date': safe_date(row[col_idx['退社日']]),
                 'employment_type': 'haken',  # Default for direct staff
-                'created_at': datetime.now().isoformat(),
+                'created_at': now_iso,
             }
 
-            columns_str = ', '.join(employee_data.keys())
-            placeholders = ', '.join(['?' for _ in employee_data])
-            sqlite_cursor.execute(
-                f"INSERT INTO employees ({columns_str}) VALUES ({placeholders})",
-                list(employee_data.values())
-            )
+            sqlite_cursor.execute(INSERT_EMPLOYEES_SQL, employee_values(employee_data))
 
             imported += 1
             emp_num += 1
@@ -416,15 +595,17 @@ def import_employees_from_dbgenzaix(access_conn, sqlite_conn, employee_number_st
 
     access_cursor = access_conn.cursor()
     sqlite_cursor = sqlite_conn.cursor()
+    now_iso = datetime.now().isoformat()  # One timestamp for the whole batch
 
     try:
-        access_cursor.execute("SELECT * FROM DBGenzaiX")
+        access_cursor.execute(build_select(access_cursor, "DBGenzaiX", HAKEN_COLUMNS))
         columns = [desc[0] for desc in access_cursor.description]
         print(f"DBGenzaiX columns ({len(columns)}): {columns[:10]}...")
     except Exception as e:
         print(f"Error: Could not access DBGenzaiX: {e}")
         return 0, employee_number_start
 
+    col_idx = {col: i for i, col in enumerate(columns)}
     rows = access_cursor.fetchall()
     print(f"Found {len(rows)} 派遣社員 records")
 
@@ -433,80 +614,68 @@ def import_employees_from_dbgenzaix(access_conn, sqlite_conn, employee_number_st
 
     for row in rows:
         try:
-            row_dict = dict(zip(columns, row))
-
             # Create employee record
             employee_data = {
                 'employee_number': emp_num,
-                'status': safe_str(row_dict.get('現在', '在職中'), 20) or '在職中',
-                'office': safe_str(row_dict.get('事務所'), 50),
-                'full_name': safe_str(row_dict.get('氏名'), 100) or f"Haken_{emp_num}",
-                'name_kana': safe_str(row_dict.get('カナ'), 100),
-                'gender': safe_str(row_dict.get('性別'), 10),
-                'nationality': safe_str(row_dict.get('国籍'), 50),
-                'birth_date': safe_date(row_dict.get('生年月日')),
-                'visa_expiry': safe_date(row_dict.get('ビザ期限')),
-                'visa_type': safe_str(row_dict.get('ビザ種類'), 100),
-                'has_spouse': bool(row_dict.get('配偶者')) if row_dict.get('配偶者') else None,
-                'postal_code': safe_str(row_dict.get('〒'), 10),
-                'address': safe_str(row_dict.get('住所')),
-                'building_name': safe_str(row_dict.get('建物名'), 100),
-                'hire_date': safe_date(row_dict.get('入社日')),
-                'termination_date': safe_date(row_dict.get('退社日')),
+                'status': safe_str(row[col_idx['現在']], 20) or '在職中',
+                'office': safe_str(row[col_idx['事務所']], 50),
+                'full_name': safe_str(row[col_idx['氏名']], 100) or f"Haken_{emp_num}",
+                'name_kana': safe_str(row[col_idx['カナ']], 100),
+                'gender': safe_str(row[col_idx['性別']], 10),
+                'nationality': safe_str(row[col_idx['国籍']], 50),
+                'birth_date': safe_date(row[col_idx['生年月日']]),
+                'visa_expiry': safe_date(row[col_idx['ビザ期限']]),
+                'visa_type': safe_str(row[col_idx['ビザ種類']], 100),
+                'has_spouse': safe_bool(row[col_idx['配偶者']]),
+                'postal_code': safe_str(row[col_idx['〒']], 10),
+                'address': safe_str(row[col_idx['住所']]),
+                'building_name': safe_str(row[col_idx['建物名']], 100),
+                'hire_date': safe_date(row[col_idx['入社日']]),
+                'termination_date': safe_date(row[col_idx['退社日']]),
                 'employment_type': 'haken',
-                'created_at': datetime.now().isoformat(),
+                'created_at': now_iso,
             }
 
-            columns_str = ', '.join(employee_data.keys())
-            placeholders = ', '.join(['?' for _ in employee_data])
-            sqlite_cursor.execute(
-                f"INSERT INTO employees ({columns_str}) VALUES ({placeholders})",
-                list(employee_data.values())
-            )
+            sqlite_cursor.execute(INSERT_EMPLOYEES_SQL, employee_values(employee_data))
             employee_id = sqlite_cursor.lastrowid
 
             # Create haken_assignment record
             assignment_data = {
                 'employee_id': employee_id,
-                'status': safe_str(row_dict.get('現在', '在職中'), 20) or '在職中',
-                'client_company': safe_str(row_dict.get('派遣先'), 200),
-                'assignment_location': safe_str(row_dict.get('配属先'), 200),
-                'assignment_line': safe_str(row_dict.get('配属ライン'), 100),
-                'job_description': safe_str(row_dict.get('仕事内容')),
-                'hourly_rate': safe_int(row_dict.get('時給')),
-                'hourly_rate_history': safe_str(row_dict.get('時給改定')),
-                'billing_rate': safe_int(row_dict.get('請求単価')),
-                'billing_rate_history': safe_str(row_dict.get('請求改定')),
-                'profit_margin': safe_int(row_dict.get('差額利益')),
-                'standard_salary': safe_int(row_dict.get('標準報酬')),
-                'health_insurance': safe_int(row_dict.get('健康保険')),
-                'nursing_insurance': safe_int(row_dict.get('介護保険')),
-                'pension': safe_int(row_dict.get('厚生年金')),
-                'social_insurance_enrolled': bool(row_dict.get('社保加入')) if row_dict.get('社保加入') else None,
-                'apartment_name': safe_str(row_dict.get('ｱﾊﾟｰﾄ'), 100),
-                'move_in_date': safe_date(row_dict.get('入居')),
-                'move_out_date': safe_date(row_dict.get('退去')),
-                'start_date': safe_date(row_dict.get('入社日')),
-                'end_date': safe_date(row_dict.get('退社日')),
-                'current_hire_date': safe_date(row_dict.get('現入社')),
-                'visa_alert': safe_str(row_dict.get('ｱﾗｰﾄ(ﾋﾞｻﾞ更新)'), 50),
-                'license_type': safe_str(row_dict.get('免許種類'), 100),
-                'license_expiry': safe_date(row_dict.get('免許期限')),
-                'commute_method': safe_str(row_dict.get('通勤方法'), 50),
-                'optional_insurance_expiry': safe_date(row_dict.get('任意保険期限')),
-                'japanese_certification': safe_str(row_dict.get('日本語検定'), 50),
-                'career_up_5th_year': safe_date(row_dict.get('キャリアアップ5年目')),
-                'entry_request': safe_str(row_dict.get('入社依頼'), 50),
-                'notes': safe_str(row_dict.get('備考')),
-                'created_at': datetime.now().isoformat(),
+                'status': safe_str(row[col_idx['現在']], 20) or '在職中',
+                'client_company': safe_str(row[col_idx['派遣先']], 200),
+                'assignment_location': safe_str(row[col_idx['配属先']], 200),
+                'assignment_line': safe_str(row[col_idx['配属ライン']], 100),
+                'job_description': safe_str(row[col_idx['仕事内容']]),
+                'hourly_rate': safe_int(row[col_idx['時給']]),
+                'hourly_rate_history': safe_str(row[col_idx['時給改定']]),
+                'billing_rate': safe_int(row[col_idx['請求単価']]),
+                'billing_rate_history': safe_str(row[col_idx['請求改定']]),
+                'profit_margin': safe_int(row[col_idx['差額利益']]),
+                'standard_salary': safe_int(row[col_idx['標準報酬']]),
+                'health_insurance': safe_int(row[col_idx['健康保険']]),
+                'nursing_insurance': safe_int(row[col_idx['介護保険']]),
+                'pension': safe_int(row[col_idx['厚生年金']]),
+                'social_insurance_enrolled': safe_bool(row[col_idx['社保加入']]),
+                'apartment_name': safe_str(row[col_idx['ｱﾊﾟｰﾄ']], 100),
+                'move_in_date': safe_date(row[col_idx['入居']]),
+                'move_out_date': safe_date(row[col_idx['退去']]),
+                'start_date': safe_date(row[col_idx['入社日']]),
+                'end_date': safe_date(row[col_idx['退社日']]),
+                'current_hire_date': safe_date(row[col_idx['現入社']]),
+                'visa_alert': safe_str(row[col_idx['ｱﾗｰﾄ(ﾋﾞｻﾞ更新)']], 50),
+                'license_type': safe_str(row[col_idx['免許種類']], 100),
+                'license_expiry': safe_date(row[col_idx['免許期限']]),
+                'commute_method': safe_str(row[col_idx['通勤方法']], 50),
+                'optional_insurance_expiry': safe_date(row[col_idx['任意保険期限']]),
+                'japanese_certification': safe_str(row[col_idx['日本語検定']], 50),
+                'career_up_5th_year': safe_date(row[col_idx['キャリアアップ5年目']]),
+                'entry_request': safe_str(row[col_idx['入社依頼']], 50),
+                'notes': safe_str(row[col_idx['備考']]),
+                'created_at': now_iso,
             }
 
-            columns_str = ', '.join(assignment_data.keys())
-            placeholders = ', '.join(['?' for _ in assignment_data])
-            sqlite_cursor.execute(
-                f"INSERT INTO haken_assignments ({columns_str}) VALUES ({placeholders})",
-                list(assignment_data.values())
-            )
+            sqlite_cursor.execute(INSERT_HAKEN_SQL, haken_values(assignment_data))
 
             imported += 1
             emp_num += 1
@@ -532,15 +701,17 @@ def import_employees_from_dbukeoi(access_conn, sqlite_conn, employee_number_star
 
     access_cursor = access_conn.cursor()
     sqlite_cursor = sqlite_conn.cursor()
+    now_iso = datetime.now().isoformat()  # One timestamp for the whole batch
 
     try:
-        access_cursor.execute("SELECT * FROM DBUkeoiX")
+        access_cursor.execute(build_select(access_cursor, "DBUkeoiX", UKEOI_COLUMNS))
         columns = [desc[0] for desc in access_cursor.description]
         print(f"DBUkeoiX columns ({len(columns)}): {columns[:10]}...")
     except Exception as e:
         print(f"Error: Could not access DBUkeoiX: {e}")
         return 0, employee_number_start
 
+    col_idx = {col: i for i, col in enumerate(columns)}
     rows = access_cursor.fetchall()
     print(f"Found {len(rows)} 請負社員 records")
 
@@ -549,75 +720,63 @@ def import_employees_from_dbukeoi(access_conn, sqlite_conn, employee_number_star
 
     for row in rows:
         try:
-            row_dict = dict(zip(columns, row))
-
             # Create employee record
             employee_data = {
                 'employee_number': emp_num,
-                'status': safe_str(row_dict.get('現在', '在職中'), 20) or '在職中',
-                'office': safe_str(row_dict.get('事務所'), 50),
-                'full_name': safe_str(row_dict.get('氏名'), 100) or f"Ukeoi_{emp_num}",
-                'name_kana': safe_str(row_dict.get('カナ'), 100),
-                'gender': safe_str(row_dict.get('性別'), 10),
-                'nationality': safe_str(row_dict.get('国籍'), 50),
-                'birth_date': safe_date(row_dict.get('生年月日')),
-                'visa_expiry': safe_date(row_dict.get('ビザ期限')),
-                'visa_type': safe_str(row_dict.get('ビザ種類'), 100),
-                'has_spouse': bool(row_dict.get('配偶者')) if row_dict.get('配偶者') else None,
-                'postal_code': safe_str(row_dict.get('〒'), 10),
-                'address': safe_str(row_dict.get('住所')),
-                'building_name': safe_str(row_dict.get('建物名'), 100),
-                'hire_date': safe_date(row_dict.get('入社日')),
-                'termination_date': safe_date(row_dict.get('退社日')),
+                'status': safe_str(row[col_idx['現在']], 20) or '在職中',
+                'office': safe_str(row[col_idx['事務所']], 50),
+                'full_name': safe_str(row[col_idx['氏名']], 100) or f"Ukeoi_{emp_num}",
+                'name_kana': safe_str(row[col_idx['カナ']], 100),
+                'gender': safe_str(row[col_idx['性別']], 10),
+                'nationality': safe_str(row[col_idx['国籍']], 50),
+                'birth_date': safe_date(row[col_idx['生年月日']]),
+                'visa_expiry': safe_date(row[col_idx['ビザ期限']]),
+                'visa_type': safe_str(row[col_idx['ビザ種類']], 100),
+                'has_spouse': safe_bool(row[col_idx['配偶者']]),
+                'postal_code': safe_str(row[col_idx['〒']], 10),
+                'address': safe_str(row[col_idx['住所']]),
+                'building_name': safe_str(row[col_idx['建物名']], 100),
+                'hire_date': safe_date(row[col_idx['入社日']]),
+                'termination_date': safe_date(row[col_idx['退社日']]),
                 'employment_type': 'ukeoi',
-                'created_at': datetime.now().isoformat(),
+                'created_at': now_iso,
             }
 
-            columns_str = ', '.join(employee_data.keys())
-            placeholders = ', '.join(['?' for _ in employee_data])
-            sqlite_cursor.execute(
-                f"INSERT INTO employees ({columns_str}) VALUES ({placeholders})",
-                list(employee_data.values())
-            )
+            sqlite_cursor.execute(INSERT_EMPLOYEES_SQL, employee_values(employee_data))
             employee_id = sqlite_cursor.lastrowid
 
             # Create ukeoi_assignment record
             assignment_data = {
                 'employee_id': employee_id,
-                'status': safe_str(row_dict.get('現在', '在職中'), 20) or '在職中',
-                'job_type': safe_str(row_dict.get('請負業務'), 200),
-                'hourly_rate': safe_int(row_dict.get('時給')),
-                'hourly_rate_history': safe_str(row_dict.get('時給改定')),
-                'profit_margin': safe_int(row_dict.get('差額利益')),
-                'standard_salary': safe_int(row_dict.get('標準報酬')),
-                'health_insurance': safe_int(row_dict.get('健康保険')),
-                'nursing_insurance': safe_int(row_dict.get('介護保険')),
-                'pension': safe_int(row_dict.get('厚生年金')),
-                'social_insurance_enrolled': bool(row_dict.get('社保加入')) if row_dict.get('社保加入') else None,
-                'commute_distance': safe_float(row_dict.get('通勤距離')),
-                'transport_allowance': safe_int(row_dict.get('交通費')),
-                'apartment_name': safe_str(row_dict.get('ｱﾊﾟｰﾄ'), 100),
-                'move_in_date': safe_date(row_dict.get('入居')),
-                'move_out_date': safe_date(row_dict.get('退去')),
-                'start_date': safe_date(row_dict.get('入社日')),
-                'end_date': safe_date(row_dict.get('退社日')),
-                'visa_alert': safe_str(row_dict.get('ｱﾗｰﾄ(ﾋﾞｻﾞ更新)'), 50),
-                'bank_account_name': safe_str(row_dict.get('口座名義'), 100),
-                'bank_name': safe_str(row_dict.get('銀行名'), 100),
-                'branch_number': safe_str(row_dict.get('支店番号'), 10),
-                'branch_name': safe_str(row_dict.get('支店名'), 100),
-                'account_number': safe_str(row_dict.get('口座番号'), 20),
-                'entry_request': safe_str(row_dict.get('入社依頼'), 50),
-                'notes': safe_str(row_dict.get('備考')),
-                'created_at': datetime.now().isoformat(),
+                'status': safe_str(row[col_idx['現在']], 20) or '在職中',
+                'job_type': safe_str(row[col_idx['請負業務']], 200),
+                'hourly_rate': safe_int(row[col_idx['時給']]),
+                'hourly_rate_history': safe_str(row[col_idx['時給改定']]),
+                'profit_margin': safe_int(row[col_idx['差額利益']]),
+                'standard_salary': safe_int(row[col_idx['標準報酬']]),
+                'health_insurance': safe_int(row[col_idx['健康保険']]),
+                'nursing_insurance': safe_int(row[col_idx['介護保険']]),
+                'pension': safe_int(row[col_idx['厚生年金']]),
+                'social_insurance_enrolled': safe_bool(row[col_idx['社保加入']]),
+                'commute_distance': safe_float(row[col_idx['通勤距離']]),
+                'transport_allowance': safe_int(row[col_idx['交通費']]),
+                'apartment_name': safe_str(row[col_idx['ｱﾊﾟｰﾄ']], 100),
+                'move_in_date': safe_date(row[col_idx['入居']]),
+                'move_out_date': safe_date(row[col_idx['退去']]),
+                'start_date': safe_date(row[col_idx['入社日']]),
+                'end_date': safe_date(row[col_idx['退社日']]),
+                'visa_alert': safe_str(row[col_idx['ｱﾗｰﾄ(ﾋﾞｻﾞ更新)']], 50),
+                'bank_account_name': safe_str(row[col_idx['口座名義']], 100),
+                'bank_name': safe_str(row[col_idx['銀行名']], 100),
+                'branch_number': safe_str(row[col_idx['支店番号']], 10),
+                'branch_name': safe_str(row[col_idx['支店名']], 100),
+                'account_number': safe_str(row[col_idx['口座番号']], 20),
+                'entry_request': safe_str(row[col_idx['入社依頼']], 50),
+                'notes': safe_str(row[col_idx['備考']]),
+                'created_at': now_iso,
             }
 
-            columns_str = ', '.join(assignment_data.keys())
-            placeholders = ', '.join(['?' for _ in assignment_data])
-            sqlite_cursor.execute(
-                f"INSERT INTO ukeoi_assignments ({columns_str}) VALUES ({placeholders})",
-                list(assignment_data.values())
-            )
+            sqlite_cursor.execute(INSERT_UKEOI_SQL, ukeoi_values(assignment_data))
 
             imported += 1
             emp_num += 1
@@ -639,28 +798,54 @@ def sync_employee_photos(sqlite_conn):
 
     cursor = sqlite_conn.cursor()
 
+    # Temporary indexes so the name + birth_date match is an index lookup
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_candidates_name_dob "
+        "ON candidates(full_name, birth_date) WHERE photo_url IS NOT NULL"
+    )
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_employees_name_dob "
+        "ON employees(full_name, birth_date) WHERE photo_url IS NULL"
+    )
+
     # Find matches by name and birth_date
-    query = """
-    UPDATE employees
-    SET photo_url = (
-        SELECT c.photo_url
+    if sqlite3.sqlite_version_info >= (3, 33, 0):
+        query = """
+        UPDATE employees
+        SET photo_url = c.photo_url
         FROM candidates c
-        WHERE c.full_name = employees.full_name
-          AND c.birth_date = employees.birth_date
-          AND c.photo_url IS NOT NULL
-        LIMIT 1
-    )
-    WHERE photo_url IS NULL
-      AND EXISTS (
-        SELECT 1 FROM candidates c
-        WHERE c.full_name = employees.full_name
-          AND c.birth_date = employees.birth_date
+        WHERE employees.full_name = c.full_name
+          AND employees.birth_date = c.birth_date
+          AND employees.photo_url IS NULL
           AND c.photo_url IS NOT NULL
-      )
-    """
+        """
+    else:
+        # UPDATE ... FROM requires SQLite 3.33+
+        query = """
+        UPDATE employees
+        SET photo_url = (
+            SELECT c.photo_url
+            FROM candidates c
+            WHERE c.full_name = employees.full_name
+              AND c.birth_date = employees.birth_date
+              AND c.photo_url IS NOT NULL
+            LIMIT 1
+        )
+        WHERE photo_url IS NULL
+          AND EXISTS (
+            SELECT 1 FROM candidates c
+            WHERE c.full_name = employees.full_name
+              AND c.birth_date = employees.birth_date
+              AND c.photo_url IS NOT NULL
+          )
+        """
 
     cursor.execute(query)
     synced = cursor.rowcount
+
+    # Indexes are only needed for the import
+    cursor.execute("DROP INDEX IF EXISTS idx_candidates_name_dob")
+    cursor.execute("DROP INDEX IF EXISTS idx_employees_name_dob")
     sqlite_conn.commit()
 
     # Count employees with photos
@@ -704,17 +889,23 @@ def main():
     # Clear existing data
     clear_sqlite_data(sqlite_conn)
 
-    # Import candidates with photos
-    candidates_count, photos_count = import_candidates(access_conn, sqlite_conn)
-
-    # Import employees
-    emp_num = 1
-    staff_count, emp_num = import_employees_from_dbstaffx(access_conn, sqlite_conn, emp_num)
-    haken_count, emp_num = import_employees_from_dbgenzaix(access_conn, sqlite_conn, emp_num)
-    ukeoi_count, emp_num = import_employees_from_dbukeoi(access_conn, sqlite_conn, emp_num)
-
-    # Sync employee photos
-    synced_photos = sync_employee_photos(sqlite_conn)
+    # Indexes are rebuilt once after loading instead of updated per insert
+    saved_indexes = drop_indexes(sqlite_conn)
+    try:
+        # Import candidates with photos
+        candidates_count, photos_count = import_candidates(access_conn, sqlite_conn)
+
+        # Import employees
+        emp_num = 1
+        staff_count, emp_num = import_employees_from_dbstaffx(access_conn, sqlite_conn, emp_num)
+        haken_count, emp_num = import_employees_from_dbgenzaix(access_conn, sqlite_conn, emp_num)
+        ukeoi_count, emp_num = import_employees_from_dbukeoi(access_conn, sqlite_conn, emp_num)
+
+        # Sync employee photos
+        synced_photos = sync_employee_photos(sqlite_conn)
+    finally:
+        sqlite_conn.rollback()
+        restore_indexes(sqlite_conn, saved_indexes)
 
     # Summary
     print("\n" + "="*60)
@@ -8,19 +8,23 @@ JSON mapping: JpkkenRirekisho12.24v1.0/legacy_resumes.json
 Usage:
     python scripts/import_photos.py --dry-run   # Preview only
     python scripts/import_photos.py             # Execute import
+    python scripts/import_photos.py --verbose   # Show first matches per phase
 """
 
 import os
 import sys
-import json
 import argparse
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 
+import ijson
+from tqdm import tqdm
+
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from sqlalchemy import create_engine, select, func, and_
+from sqlalchemy import create_engine, select, update, func, and_
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
 from app.models.models import Candidate, Employee
@@ -31,8 +35,9 @@ PHOTOS_DIR = Path("C:/Users/Jpkken/UNSRireki-Prov26.1.4/backend/uploads/photos")
 LEGACY_JSON = Path("C:/Users/Jpkken/JpkkenRirekisho12.24v1.0/legacy_resumes.json")
 
 
+@lru_cache(maxsize=4096)
 def parse_date(date_str):
-    """Parse date from various formats."""
+    """Parse date from various formats (cached; birth dates repeat often)."""
     if not date_str or date_str == "NaT":
         return None
 
@@ -50,41 +55,71 @@ def parse_date(date_str):
     return None
 
 
+def to_legacy_id(value):
+    """Normalize a 履歴書ID (int, float or digit string in the JSON) to int."""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
 def load_legacy_resumes():
-    """Load legacy resumes JSON."""
-    print(f"Loading legacy resumes from: {LEGACY_JSON}")
-    with open(LEGACY_JSON, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-    print(f"  Loaded {len(data)} records")
-    return data
+    """Stream legacy resumes JSON one record at a time.
+
+    Yields ``(legacy_id, photo_filename, name, dob_str)`` tuples with
+    ``legacy_id`` normalized to int to match ``Candidate.legacy_id``.
+    """
+    with open(LEGACY_JSON, 'rb') as f:
+        for r in ijson.items(f, 'item', use_float=True):
+            yield (to_legacy_id(r.get('履歴書ID')), r.get('写真', ''), r.get('氏名', ''), r.get('生年月日', ''))
+
+
+PHOTO_EXTENSIONS = ('jpg', 'jpeg', 'png', 'gif')
+STEM_EXTENSIONS = ('jpg', 'jpeg', 'png')  # Preference order for stem lookups
 
 
 def get_available_photos():
-    """Get set of available photo filenames."""
+    """Get available photo filenames and a lowercased-stem index.
+
+    Returns ``(names, stem_index)`` where ``stem_index`` maps a lowercased
+    stem to its filename.
+    """
     if not PHOTOS_DIR.exists():
         print(f"ERROR: Photos directory not found: {PHOTOS_DIR}")
-        return set()
+        return set(), {}
 
     photos = set()
-    for f in PHOTOS_DIR.iterdir():
-        if f.is_file() and f.suffix.lower() in ['.jpg', '.jpeg', '.png', '.gif']:
-            photos.add(f.name)
+    stem_index = {}
+    stem_rank = {}
+    with os.scandir(PHOTOS_DIR) as it:
+        for entry in it:
+            stem, _, ext = entry.name.rpartition('.')
+            ext = ext.lower()
+            if not stem or ext not in PHOTO_EXTENSIONS or not entry.is_file(follow_symlinks=False):
+                continue
+            photos.add(entry.name)
+            if ext not in STEM_EXTENSIONS:
+                continue
+
+            # Keep the preferred extension when several files share a stem
+            key = stem.lower()
+            rank = STEM_EXTENSIONS.index(ext)
+            if rank < stem_rank.get(key, len(STEM_EXTENSIONS)):
+                stem_rank[key] = rank
+                stem_index[key] = entry.name
 
     print(f"  Found {len(photos)} photo files")
-    return photos
+    return photos, stem_index
 
 
-def import_photos_to_candidates(session, dry_run=True):
+def import_photos_to_candidates(session, available_photos, dry_run=True, verbose=False):
     """Import photos to candidates based on legacy_resumes.json."""
     print("\n" + "="*60)
     print("PHASE 1: Import photos to CANDIDATES")
     print("="*60)
 
-    # Load data
-    resumes = load_legacy_resumes()
-    available_photos = get_available_photos()
-
     stats = {
+        'total': 0,
         'matched': 0,
         'no_photo': 0,
         'photo_not_found': 0,
@@ -93,26 +128,37 @@ def import_photos_to_candidates(session, dry_run=True):
         'errors': 0
     }
 
-    # Get all candidates for matching
-    candidates = session.execute(select(Candidate)).scalars().all()
+    # Get only the columns needed for matching
+    candidates = session.execute(
+        select(
+            Candidate.id,
+            Candidate.legacy_id,
+            Candidate.full_name,
+            Candidate.birth_date,
+            Candidate.photo_url,
+        )
+    ).all()
     print(f"  Found {len(candidates)} candidates in database")
 
     # Create lookup maps
-    by_legacy_id = {c.legacy_id: c for c in candidates if c.legacy_id}
+    by_legacy_id = {int(c.legacy_id): c for c in candidates if c.legacy_id is not None}
+    # Keyed by (upper-cased name, date); both sides use date objects
     by_name_dob = {}
     for c in candidates:
         if c.full_name and c.birth_date:
-            key = (c.full_name.strip().upper(), str(c.birth_date))
+            key = (c.full_name.strip().upper(), c.birth_date)
             by_name_dob[key] = c
 
     print(f"  Lookup: {len(by_legacy_id)} by legacy_id, {len(by_name_dob)} by name+dob")
 
-    # Process each resume
-    for resume in resumes:
-        legacy_id = resume.get('履歴書ID')
-        photo_filename = resume.get('写真', '')
-        name = resume.get('氏名', '')
-        dob_str = resume.get('生年月日', '')
+    # Collected {id, photo_url} mappings for one bulk UPDATE
+    updates = []
+    linked_ids = set()
+
+    # Process each resume as it is parsed
+    print(f"  Streaming legacy resumes from: {LEGACY_JSON}")
+    for legacy_id, photo_filename, name, dob_str in tqdm(load_legacy_resumes(), desc='candidates', unit=' resumes'):
+        stats['total'] += 1
 
         # Skip if no photo
         if not photo_filename:
@@ -128,42 +174,41 @@ def import_photos_to_candidates(session, dry_run=True):
         candidate = None
 
         # Try by legacy_id first
-        if legacy_id and legacy_id in by_legacy_id:
-            candidate = by_legacy_id[legacy_id]
+        if legacy_id is not None:
+            candidate = by_legacy_id.get(legacy_id)
 
-        # Try by name + dob
+        # Fall back to name + dob only when the id lookup misses
         if not candidate and name and dob_str:
             dob = parse_date(dob_str)
             if dob:
-                key = (name.strip().upper(), str(dob))
-                candidate = by_name_dob.get(key)
+                candidate = by_name_dob.get((name.strip().upper(), dob))
 
         if not candidate:
             stats['candidate_not_found'] += 1
             continue
 
         # Skip if already has photo
-        if candidate.photo_url:
+        if candidate.photo_url or candidate.id in linked_ids:
             stats['already_has_photo'] += 1
             continue
 
         # Set photo URL
         photo_url = f"/uploads/photos/{photo_filename}"
-
-        if not dry_run:
-            candidate.photo_url = photo_url
+        updates.append({'id': candidate.id, 'photo_url': photo_url})
+        linked_ids.add(candidate.id)
 
         stats['matched'] += 1
 
-        if stats['matched'] <= 5:
-            print(f"  + {candidate.full_name} -> {photo_filename}")
+        if verbose and stats['matched'] <= 5:
+            tqdm.write(f"  + {candidate.full_name} -> {photo_filename}")
 
-    # Commit if not dry run
-    if not dry_run:
-        session.commit()
-        print("\n  Changes committed to database.")
+    # Bulk UPDATE by primary key if not dry run
+    if updates and not dry_run:
+        session.execute(update(Candidate), updates)
+        print(f"\n  Updated {len(updates)} candidates.")
 
     print("\n  --- Candidate Photo Import Stats ---")
+    print(f"  Resumes processed: {stats['total']}")
     print(f"  Matched & updated: {stats['matched']}")
     print(f"  Already has photo: {stats['already_has_photo']}")
     print(f"  No photo in JSON: {stats['no_photo']}")
@@ -173,16 +218,21 @@ def import_photos_to_candidates(session, dry_run=True):
     return stats
 
 
-def import_photos_to_employees_by_number(session, dry_run=True):
+def import_photos_to_employees_by_number(session, stem_index, dry_run=True, verbose=False):
     """Import photos to employees based on employee number matching filename."""
     print("\n" + "="*60)
     print("PHASE 2: Import photos to EMPLOYEES (by employee number)")
     print("="*60)
 
-    available_photos = get_available_photos()
-
-    # Get all employees
-    employees = session.execute(select(Employee)).scalars().all()
+    # Get only the columns needed for matching
+    employees = session.execute(
+        select(
+            Employee.id,
+            Employee.employee_number,
+            Employee.full_name,
+            Employee.photo_url,
+        )
+    ).all()
     print(f"  Found {len(employees)} employees in database")
 
     stats = {
@@ -191,7 +241,10 @@ def import_photos_to_employees_by_number(session, dry_run=True):
         'no_matching_photo': 0
     }
 
-    for emp in employees:
+    # Collected {id, photo_url} mappings for one bulk UPDATE
+    updates = []
+
+    for emp in tqdm(employees, desc='employees'):
         if not emp.employee_number:
             continue
 
@@ -203,13 +256,7 @@ def import_photos_to_employees_by_number(session, dry_run=True):
         # Look for photo matching employee number
         emp_num = str(emp.employee_number).strip()
 
-        # Try various extensions
-        photo_found = None
-        for ext in ['.jpg', '.jpeg', '.png', '.JPG', '.JPEG', '.PNG']:
-            filename = f"{emp_num}{ext}"
-            if filename in available_photos:
-                photo_found = filename
-                break
+        photo_found = stem_index.get(emp_num.lower())
 
         if not photo_found:
             stats['no_matching_photo'] += 1
@@ -217,18 +264,17 @@ def import_photos_to_employees_by_number(session, dry_run=True):
 
         # Set photo URL
         photo_url = f"/uploads/photos/{photo_found}"
-
-        if not dry_run:
-            emp.photo_url = photo_url
+        updates.append({'id': emp.id, 'photo_url': photo_url})
 
         stats['matched'] += 1
 
-        if stats['matched'] <= 5:
-            print(f"  + {emp.full_name} ({emp_num}) -> {photo_found}")
+        if verbose and stats['matched'] <= 5:
+            tqdm.write(f"  + {emp.full_name} ({emp_num}) -> {photo_found}")
 
-    if not dry_run:
-        session.commit()
-        print("\n  Changes committed to database.")
+    # Bulk UPDATE by primary key if not dry run
+    if updates and not dry_run:
+        session.execute(update(Employee), updates)
+        print(f"\n  Updated {len(updates)} employees.")
 
     print("\n  --- Employee Photo Import Stats ---")
     print(f"  Matched & updated: {stats['matched']}")
@@ -241,6 +287,7 @@ def import_photos_to_employees_by_number(session, dry_run=True):
 def main():
     parser = argparse.ArgumentParser(description='Import photos from legacy system')
     parser.add_argument('--dry-run', action='store_true', help='Preview only, no changes')
+    parser.add_argument('--verbose', action='store_true', help='Show the first matches of each phase')
     args = parser.parse_args()
 
     print("="*60)
@@ -257,12 +304,24 @@ def main():
     engine = create_engine(db_url, echo=False)
     Session = sessionmaker(bind=engine)
 
-    with Session() as session:
+    # Scan the photos directory once for both phases
+    print(f"\nScanning photos in: {PHOTOS_DIR}")
+    available_photos, stem_index = get_available_photos()
+
+    # Both phases run in one transaction, committed on exit
+    with Session.begin() as session:
         # Phase 1: Import to candidates
-        candidate_stats = import_photos_to_candidates(session, dry_run=args.dry_run)
+        candidate_stats = import_photos_to_candidates(
+            session, available_photos, dry_run=args.dry_run, verbose=args.verbose
+        )
 
         # Phase 2: Import to employees by number
-        employee_stats = import_photos_to_employees_by_number(session, dry_run=args.dry_run)
+        employee_stats = import_photos_to_employees_by_number(
+            session, stem_index, dry_run=args.dry_run, verbose=args.verbose
+        )
+
+    if not args.dry_run:
+        print("\nChanges committed to database.")
 
     print("\n" + "="*60)
     print("SUMMARY")
@@ -12,7 +12,7 @@ import os
 import sys
 import json
 import argparse
-from datetime import datetime, date
+from datetime import date
 from pathlib import Path
 
 
@@ -30,6 +30,11 @@ def parse_args():
         default="./exports",
         help="Directory to export extracted data"
     )
+    parser.add_argument(
+        "--pretty",
+        action="store_true",
+        help="Indent JSON output for reading"
+    )
     parser.add_argument(
         "--extract-attachments",
         action="store_true",
@@ -61,54 +66,43 @@ def connect_access(db_path: str):
         sys.exit(1)
 
 
-def extract_candidates(conn) -> list:
-    """Extract all candidates from T_履歴書 table."""
-    cursor = conn.cursor()
+# T_履歴書 column -> candidates field
+CANDIDATE_COLUMNS = {
+    '履歴書ID': 'legacy_id',
+    '氏名': 'full_name',
+    'カナ': 'name_kana',
+    '性別': 'gender',
+    '国籍': 'nationality',
+    '生年月日': 'birth_date',
+    '備考': 'notes',
+}
 
-    # Query all columns from T_履歴書
-    query = """
-    SELECT
-        [履歴書ID],
-        [氏名],
-        [カナ],
-        [性別],
-        [国籍],
-        [生年月日],
-        [備考]
-    FROM [T_履歴書]
-    """
 
-    cursor.execute(query)
-    columns = [column[0] for column in cursor.description]
-    rows = cursor.fetchall()
+def extract_candidates(conn) -> list:
+    """Extract all candidates from T_履歴書 table."""
+    import pandas as pd
 
-    candidates = []
-    for row in rows:
-        candidate = dict(zip(columns, row))
+    cursor = conn.cursor()
+    # Buffer rows from the ODBC driver in large blocks
+    cursor.arraysize = 10000
 
-        # Convert dates
-        if candidate.get('生年月日'):
-            birth_date = candidate['生年月日']
-            if isinstance(birth_date, datetime):
-                candidate['birth_date'] = birth_date.strftime('%Y-%m-%d')
-            elif isinstance(birth_date, date):
-                candidate['birth_date'] = birth_date.strftime('%Y-%m-%d')
+    columns = ', '.join(f'[{name}]' for name in CANDIDATE_COLUMNS)
+    cursor.execute(f"SELECT {columns} FROM [T_履歴書]")
+    names = [column[0] for column in cursor.description]
 
-        # Map to new schema
-        mapped = {
-            'legacy_id': candidate.get('履歴書ID'),
-            'full_name': candidate.get('氏名', ''),
-            'name_kana': candidate.get('カナ'),
-            'gender': candidate.get('性別'),
-            'nationality': candidate.get('国籍'),
-            'birth_date': candidate.get('birth_date'),
-            'notes': candidate.get('備考'),
-            'status': 'registered',
-        }
+    df = pd.DataFrame.from_records(cursor.fetchall(), columns=names)
+    df = df.rename(columns=CANDIDATE_COLUMNS)
 
-        candidates.append(mapped)
+    # Convert dates per value: a vectorised to_datetime turns anything outside
+    # 1677-2262 (e.g. 9999-12-31 placeholders) into NaT
+    df['birth_date'] = [
+        value.strftime('%Y-%m-%d') if isinstance(value, date) and pd.notna(value) else None
+        for value in df['birth_date']
+    ]
+    df['status'] = 'registered'
 
-    return candidates
+    df = df.astype(object).where(df.notna(), None)
+    return df.to_dict('records')
 
 
 def extract_attachments(conn, output_dir: str):
@@ -171,12 +165,24 @@ End Sub
     print("Run this script in Access VBA editor to export attachments.")
 
 
-def save_json(data: list, output_path: str):
-    """Save extracted data to JSON file."""
+def save_json(data: list, output_path: str, pretty: bool = False):
+    """Save extracted data to JSON file (compact unless pretty is set)."""
     Path(output_path).parent.mkdir(parents=True, exist_ok=True)
 
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2, default=str)
+    try:
+        import orjson
+    except ImportError:
+        orjson = None
+
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_PASSTHROUGH_DATETIME
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        with open(output_path, 'wb') as f:
+            f.write(orjson.dumps(data, default=str, option=option))
+    else:
+        with open(output_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2 if pretty else None, default=str)
 
     print(f"Saved {len(data)} candidates to: {output_path}")
 
@@ -193,7 +199,7 @@ def main():
 
     # Save to JSON
     output_path = Path(args.output_dir) / "candidates.json"
-    save_json(candidates, str(output_path))
+    save_json(candidates, str(output_path), pretty=args.pretty)
 
     # Extract attachments if requested
     if args.extract_attachments:
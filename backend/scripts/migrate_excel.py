@@ -14,11 +14,99 @@ import os
 import sys
 import json
 import argparse
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, date
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, List, Any, Optional
 
 
+# DBStaffX column mapping (1-indexed to match Excel)
+STAFF_COLUMNS = {
+    1: 'status',           # №
+    2: 'employee_number',  # 社員№
+    3: 'office',           # 事務所
+    4: 'full_name',        # 氏名
+    5: 'name_kana',        # カナ
+    6: 'gender',           # 性別
+    7: 'nationality',      # 国籍
+    8: 'birth_date',       # 生年月日
+    9: 'age',              # 年齢
+    10: 'visa_expiry',     # ビザ期限
+    11: 'visa_type',       # ビザ種類
+    12: 'has_spouse',      # 配偶者
+    13: 'postal_code',     # 〒
+    14: 'address',         # 住所
+    15: 'building_name',   # 建物名
+    16: 'hire_date',       # 入社日
+    17: 'termination_date' # 退社日
+}
+
+# DBGenzaiX column mapping for key fields
+HAKEN_COLUMNS = {
+    1: 'status',                # 現在
+    2: 'employee_number',       # 社員№
+    3: 'client_company_id',     # 派遣先ID
+    4: 'client_company',        # 派遣先
+    5: 'assignment_location',   # 配属先
+    6: 'assignment_line',       # 配属ライン
+    7: 'job_description',       # 仕事内容
+    8: 'full_name',             # 氏名
+    14: 'hourly_rate',          # 時給
+    15: 'hourly_rate_history',  # 時給改定
+    16: 'billing_rate',         # 請求単価
+    17: 'billing_rate_history', # 請求改定
+    18: 'profit_margin',        # 差額利益
+    19: 'standard_salary',      # 標準報酬
+    20: 'health_insurance',     # 健康保険
+    21: 'nursing_insurance',    # 介護保険
+    22: 'pension',              # 厚生年金
+    23: 'visa_expiry',          # ビザ期限
+    28: 'apartment_name',       # ｱﾊﾟｰﾄ
+    29: 'move_in_date',         # 入居
+    30: 'start_date',           # 入社日
+    31: 'end_date',             # 退社日
+    33: 'social_insurance_enrolled',  # 社保加入
+    37: 'license_type',         # 免許種類
+    38: 'license_expiry',       # 免許期限
+    39: 'commute_method',       # 通勤方法
+    41: 'japanese_certification' # 日本語検定
+}
+
+# DBUkeoiX column mapping for key fields
+UKEOI_COLUMNS = {
+    1: 'status',               # 現在
+    2: 'employee_number',      # 社員№
+    3: 'job_type',             # 請負業務
+    4: 'full_name',            # 氏名
+    10: 'hourly_rate',         # 時給
+    11: 'hourly_rate_history', # 時給改定
+    16: 'commute_distance',    # 通勤距離
+    17: 'transport_allowance', # 交通費
+    18: 'profit_margin',       # 差額利益
+    24: 'apartment_name',      # ｱﾊﾟｰﾄ
+    25: 'move_in_date',        # 入居
+    26: 'start_date',          # 入社日
+    27: 'end_date',            # 退社日
+    30: 'bank_account_name',   # 口座名義
+    31: 'bank_name',           # 銀行名
+    32: 'branch_number',       # 支店番号
+    33: 'branch_name',         # 支店名
+    34: 'account_number',      # 口座番号
+}
+
+# Fields converted after extraction
+STAFF_DATE_FIELDS = ['birth_date', 'visa_expiry', 'hire_date', 'termination_date']
+HAKEN_DATE_FIELDS = ['visa_expiry', 'move_in_date', 'start_date', 'end_date', 'license_expiry']
+HAKEN_INT_FIELDS = ['hourly_rate', 'billing_rate', 'profit_margin', 'standard_salary',
+                    'health_insurance', 'nursing_insurance', 'pension']
+UKEOI_DATE_FIELDS = ['move_in_date', 'start_date', 'end_date']
+UKEOI_INT_FIELDS = ['hourly_rate', 'transport_allowance', 'profit_margin']
+
+# Excel serial day 0 (1899-12-30, accounting for the 1900 leap-year bug)
+_EXCEL_EPOCH_ORDINAL = date(1899, 12, 30).toordinal()
+
+
 def parse_args():
     parser = argparse.ArgumentParser(
         description="Migrate Excel 社員台帳 to PostgreSQL"
@@ -33,6 +121,16 @@ def parse_args():
         default="./exports",
         help="Directory to export extracted data"
     )
+    parser.add_argument(
+        "--pretty",
+        action="store_true",
+        help="Indent JSON output for reading"
+    )
+    parser.add_argument(
+        "--load-into-db",
+        action="store_true",
+        help="Also bulk-insert the extracted rows into DATABASE_URL"
+    )
     return parser.parse_args()
 
 
@@ -45,39 +143,62 @@ def load_excel(file_path: str):
         sys.exit(1)
 
     try:
-        return openpyxl.load_workbook(file_path, data_only=True)
+        return openpyxl.load_workbook(file_path, read_only=True, data_only=True)
     except Exception as e:
         print(f"Error loading Excel file: {e}")
         sys.exit(1)
 
 
-def parse_date(value) -> Optional[str]:
-    """Parse various date formats to ISO string."""
-    if value is None:
-        return None
+@lru_cache(maxsize=4096)
+def _parse_date_str(value: str) -> Optional[str]:
+    """Parse a date string to ISO format (cached; sheets repeat the same dates)."""
+    for fmt in ['%Y/%m/%d', '%Y-%m-%d', '%Y年%m月%d日']:
+        try:
+            return datetime.strptime(value, fmt).strftime('%Y-%m-%d')
+        except ValueError:
+            continue
+    return None
 
-    if isinstance(value, datetime):
-        return value.strftime('%Y-%m-%d')
-    if isinstance(value, date):
-        return value.strftime('%Y-%m-%d')
 
-    # Try to parse string dates
-    if isinstance(value, str):
-        for fmt in ['%Y/%m/%d', '%Y-%m-%d', '%Y年%m月%d日']:
-            try:
-                return datetime.strptime(value, fmt).strftime('%Y-%m-%d')
-            except ValueError:
-                continue
+def _from_datetime(value) -> str:
+    return value.strftime('%Y-%m-%d')
 
-    # Excel serial date number
-    if isinstance(value, (int, float)) and value > 25000:
+
+def _from_serial(value) -> Optional[str]:
+    """Excel serial date number."""
+    if value > 25000:
         try:
-            from datetime import timedelta
-            base_date = datetime(1899, 12, 30)
-            return (base_date + timedelta(days=int(value))).strftime('%Y-%m-%d')
-        except:
+            return date.fromordinal(_EXCEL_EPOCH_ORDINAL + int(value)).isoformat()
+        except (ValueError, OverflowError):
             pass
+    return None
 
+
+# Exact cell type -> converter
+_DATE_HANDLERS = {
+    datetime: _from_datetime,
+    date: _from_datetime,
+    str: _parse_date_str,
+    int: _from_serial,
+    float: _from_serial,
+}
+
+
+def parse_date(value) -> Optional[str]:
+    """Parse various date formats to ISO string."""
+    handler = _DATE_HANDLERS.get(type(value))
+    if handler is None:
+        # Subclasses (pd.Timestamp, numpy floats, bool) resolve through the MRO
+        handler = next((_DATE_HANDLERS[t] for t in type(value).__mro__ if t in _DATE_HANDLERS), None)
+    return handler(value) if handler else None
+
+
+def _to_int(value) -> Optional[int]:
+    """Coerce a numeric cell to int; cells openpyxl already parsed skip str()."""
+    if isinstance(value, (int, float)):
+        return int(value)
+    if isinstance(value, str) and value.lstrip('-').isdigit():
+        return int(value)
     return None
 
 
@@ -91,29 +212,12 @@ def extract_staff_master(wb) -> List[Dict]:
     ws = wb[sheet_name]
     employees = []
 
-    # Column mapping (1-indexed to match Excel)
-    columns = {
-        1: 'status',           # №
-        2: 'employee_number',  # 社員№
-        3: 'office',           # 事務所
-        4: 'full_name',        # 氏名
-        5: 'name_kana',        # カナ
-        6: 'gender',           # 性別
-        7: 'nationality',      # 国籍
-        8: 'birth_date',       # 生年月日
-        9: 'age',              # 年齢
-        10: 'visa_expiry',     # ビザ期限
-        11: 'visa_type',       # ビザ種類
-        12: 'has_spouse',      # 配偶者
-        13: 'postal_code',     # 〒
-        14: 'address',         # 住所
-        15: 'building_name',   # 建物名
-        16: 'hire_date',       # 入社日
-        17: 'termination_date' # 退社日
-    }
+    columns = STAFF_COLUMNS
+    # Read only up to the last mapped column
+    max_col = max(columns)
 
     # Skip header row
-    for row_idx, row in enumerate(ws.iter_rows(min_row=2, values_only=True), start=2):
+    for row_idx, row in enumerate(ws.iter_rows(min_row=2, max_col=max_col, values_only=True), start=2):
         if not row[1]:  # Skip empty rows (no employee number)
             continue
 
@@ -122,7 +226,7 @@ def extract_staff_master(wb) -> List[Dict]:
             value = row[col_idx - 1] if col_idx <= len(row) else None
 
             # Parse dates
-            if key in ['birth_date', 'visa_expiry', 'hire_date', 'termination_date']:
+            if key in STAFF_DATE_FIELDS:
                 value = parse_date(value)
 
             # Parse boolean
@@ -146,38 +250,11 @@ def extract_haken(wb) -> List[Dict]:
     ws = wb[sheet_name]
     assignments = []
 
-    # Column mapping for key fields
-    columns = {
-        1: 'status',                # 現在
-        2: 'employee_number',       # 社員№
-        3: 'client_company_id',     # 派遣先ID
-        4: 'client_company',        # 派遣先
-        5: 'assignment_location',   # 配属先
-        6: 'assignment_line',       # 配属ライン
-        7: 'job_description',       # 仕事内容
-        8: 'full_name',             # 氏名
-        14: 'hourly_rate',          # 時給
-        15: 'hourly_rate_history',  # 時給改定
-        16: 'billing_rate',         # 請求単価
-        17: 'billing_rate_history', # 請求改定
-        18: 'profit_margin',        # 差額利益
-        19: 'standard_salary',      # 標準報酬
-        20: 'health_insurance',     # 健康保険
-        21: 'nursing_insurance',    # 介護保険
-        22: 'pension',              # 厚生年金
-        23: 'visa_expiry',          # ビザ期限
-        28: 'apartment_name',       # ｱﾊﾟｰﾄ
-        29: 'move_in_date',         # 入居
-        30: 'start_date',           # 入社日
-        31: 'end_date',             # 退社日
-        33: 'social_insurance_enrolled',  # 社保加入
-        37: 'license_type',         # 免許種類
-        38: 'license_expiry',       # 免許期限
-        39: 'commute_method',       # 通勤方法
-        41: 'japanese_certification' # 日本語検定
-    }
-
-    for row_idx, row in enumerate(ws.iter_rows(min_row=2, values_only=True), start=2):
+    columns = HAKEN_COLUMNS
+    # Read only up to the last mapped column
+    max_col = max(columns)
+
+    for row_idx, row in enumerate(ws.iter_rows(min_row=2, max_col=max_col, values_only=True), start=2):
         if not row[1]:  # Skip empty rows
             continue
 
@@ -186,13 +263,12 @@ def extract_haken(wb) -> List[Dict]:
             value = row[col_idx - 1] if col_idx <= len(row) else None
 
             # Parse dates
-            if key in ['visa_expiry', 'move_in_date', 'start_date', 'end_date', 'license_expiry']:
+            if key in HAKEN_DATE_FIELDS:
                 value = parse_date(value)
 
             # Parse numbers
-            if key in ['hourly_rate', 'billing_rate', 'profit_margin', 'standard_salary',
-                      'health_insurance', 'nursing_insurance', 'pension']:
-                value = int(value) if value and str(value).isdigit() else None
+            if key in HAKEN_INT_FIELDS:
+                value = _to_int(value)
 
             assignment[key] = value
 
@@ -211,29 +287,11 @@ def extract_ukeoi(wb) -> List[Dict]:
     ws = wb[sheet_name]
     assignments = []
 
-    # Column mapping for key fields
-    columns = {
-        1: 'status',               # 現在
-        2: 'employee_number',      # 社員№
-        3: 'job_type',             # 請負業務
-        4: 'full_name',            # 氏名
-        10: 'hourly_rate',         # 時給
-        11: 'hourly_rate_history', # 時給改定
-        16: 'commute_distance',    # 通勤距離
-        17: 'transport_allowance', # 交通費
-        18: 'profit_margin',       # 差額利益
-        24: 'apartment_name',      # ｱﾊﾟｰﾄ
-        25: 'move_in_date',        # 入居
-        26: 'start_date',          # 入社日
-        27: 'end_date',            # 退社日
-        30: 'bank_account_name',   # 口座名義
-        31: 'bank_name',           # 銀行名
-        32: 'branch_number',       # 支店番号
-        33: 'branch_name',         # 支店名
-        34: 'account_number',      # 口座番号
-    }
-
-    for row_idx, row in enumerate(ws.iter_rows(min_row=2, values_only=True), start=2):
+    columns = UKEOI_COLUMNS
+    # Read only up to the last mapped column
+    max_col = max(columns)
+
+    for row_idx, row in enumerate(ws.iter_rows(min_row=2, max_col=max_col, values_only=True), start=2):
         if not row[1]:  # Skip empty rows
             continue
 
@@ -242,12 +300,12 @@ def extract_ukeoi(wb) -> List[Dict]:
             value = row[col_idx - 1] if col_idx <= len(row) else None
 
             # Parse dates
-            if key in ['move_in_date', 'start_date', 'end_date']:
+            if key in UKEOI_DATE_FIELDS:
                 value = parse_date(value)
 
             # Parse numbers
-            if key in ['hourly_rate', 'transport_allowance', 'profit_margin']:
-                value = int(value) if value and str(value).isdigit() else None
+            if key in UKEOI_INT_FIELDS:
+                value = _to_int(value)
 
             # Parse decimal
             if key == 'commute_distance':
@@ -263,12 +321,273 @@ def extract_ukeoi(wb) -> List[Dict]:
     return assignments
 
 
-def save_json(data: list, output_path: str):
-    """Save extracted data to JSON file."""
+def _read_sheet_frame(xl, sheet_name: str, columns: Dict[int, str]):
+    """Read mapped columns of a sheet into a DataFrame with None for blanks."""
+    import pandas as pd
+
+    df = xl.parse(sheet_name, header=None, skiprows=1, dtype=object)
+    # Select by 1-indexed position; positions past the used range become blank
+    df = df.reindex(columns=[col_idx - 1 for col_idx in columns])
+    df.columns = list(columns.values())
+
+    # Skip empty rows (no employee number)
+    key = df['employee_number']
+    df = df[key.notna() & (key != 0) & (key != '')]
+    return df.astype(object).where(df.notna(), None)
+
+
+def _coerce_int_columns(df, keys: List[str]):
+    """Vectorized numeric coercion; non-numeric cells become None."""
+    import numpy as np
+    import pandas as pd
+
+    for key in keys:
+        numbers = np.trunc(pd.to_numeric(df[key], errors='coerce'))
+        df[key] = numbers.astype('Int64').astype(object).where(numbers.notna(), None)
+
+
+def _frame_records(df) -> List[Dict]:
+    """Convert a frame to records of plain Python values."""
+    records = df.astype(object).where(df.notna(), None).to_dict('records')
+    for record in records:
+        for key, value in record.items():
+            if hasattr(value, 'item'):  # numpy scalar
+                record[key] = value.item()
+    return records
+
+
+def _calamine_sheet(file_path: str, sheet_name: str) -> List[Dict]:
+    """Extract one sheet with pandas + calamine (process pool worker)."""
+    import pandas as pd
+
+    try:
+        xl = pd.ExcelFile(file_path, engine='calamine')
+    except Exception as e:
+        print(f"Error loading Excel file: {e}")
+        sys.exit(1)
+
+    if sheet_name not in xl.sheet_names:
+        print(f"Warning: Sheet '{sheet_name}' not found")
+        return []
+
+    if sheet_name == 'DBStaffX':
+        df = _read_sheet_frame(xl, sheet_name, STAFF_COLUMNS)
+        for key in STAFF_DATE_FIELDS:
+            df[key] = df[key].map(parse_date)
+        spouse = df['has_spouse']
+        df['has_spouse'] = spouse.map(lambda v: v == '有' if isinstance(v, str) else bool(v))
+
+    elif sheet_name == 'DBGenzaiX':
+        df = _read_sheet_frame(xl, sheet_name, HAKEN_COLUMNS)
+        df.insert(0, 'employment_type', 'haken')
+        for key in HAKEN_DATE_FIELDS:
+            df[key] = df[key].map(parse_date)
+        _coerce_int_columns(df, HAKEN_INT_FIELDS)
+
+    else:
+        df = _read_sheet_frame(xl, sheet_name, UKEOI_COLUMNS)
+        df.insert(0, 'employment_type', 'ukeoi')
+        for key in UKEOI_DATE_FIELDS:
+            df[key] = df[key].map(parse_date)
+        _coerce_int_columns(df, UKEOI_INT_FIELDS)
+        distance = pd.to_numeric(df['commute_distance'], errors='coerce')
+        df['commute_distance'] = distance.astype(object).where(distance.notna(), None)
+
+    return _frame_records(df)
+
+
+def _openpyxl_sheet(file_path: str, sheet_name: str) -> List[Dict]:
+    """Extract one sheet with openpyxl (process pool worker)."""
+    wb = load_excel(file_path)
+    try:
+        return SHEET_EXTRACTORS[sheet_name](wb)
+    finally:
+        wb.close()
+
+
+SHEET_EXTRACTORS = {
+    'DBStaffX': extract_staff_master,
+    'DBGenzaiX': extract_haken,
+    'DBUkeoiX': extract_ukeoi,
+}
+
+
+def extract_sheets(file_path: str, worker) -> Dict[str, List[Dict]]:
+    """Extract all three sheets in parallel, one process per sheet.
+
+    Workbooks can't be pickled, so each worker opens the file itself.
+    """
+    with ProcessPoolExecutor(max_workers=len(SHEET_EXTRACTORS)) as pool:
+        futures = {
+            sheet_name: pool.submit(worker, file_path, sheet_name)
+            for sheet_name in SHEET_EXTRACTORS
+        }
+        return {sheet_name: future.result() for sheet_name, future in futures.items()}
+
+
+def extract_with_calamine(file_path: str) -> Optional[Dict[str, List[Dict]]]:
+    """Extract all three sheets with pandas + calamine.
+
+    Returns None when pandas or python-calamine is not installed so the
+    caller can fall back to openpyxl.
+    """
+    try:
+        import pandas  # noqa: F401
+        import python_calamine  # noqa: F401
+    except ImportError:
+        return None
+
+    return extract_sheets(file_path, _calamine_sheet)
+
+
+def _table_rows(table, records: List[Dict], **fixed) -> List[Dict]:
+    """Shape extracted records for a table insert.
+
+    Keeps only the table's columns and converts ISO date strings and
+    flag values to the Python types the column expects.
+    """
+    from sqlalchemy import Boolean, Date
+
+    date_cols = {c.name for c in table.columns if isinstance(c.type, Date)}
+    bool_cols = {c.name for c in table.columns if isinstance(c.type, Boolean)}
+    names = set(table.columns.keys()) - {'id', 'created_at', 'updated_at'}
+
+    rows = []
+    for record in records:
+        row = {key: value for key, value in record.items() if key in names}
+        for key in date_cols & row.keys():
+            if isinstance(row[key], str):
+                row[key] = date.fromisoformat(row[key])
+        for key in bool_cols & row.keys():
+            value = row[key]
+            if value is not None and not isinstance(value, bool):
+                row[key] = value == '有' if isinstance(value, str) else bool(value)
+        row.update(fixed)
+        rows.append(row)
+    return rows
+
+
+def load_into_db(staff_master: List[Dict], haken: List[Dict], ukeoi: List[Dict]):
+    """Bulk-load extracted rows into the application database.
+
+    Employees come from DBStaffX, plus any DBGenzaiX/DBUkeoiX worker missing
+    from it (built from the assignment row, as import_employees does);
+    assignments are attached by employee number. Employee numbers already in
+    the database are skipped so reruns are safe.
+    """
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+    from sqlalchemy import create_engine, select
+    from app.core.config import settings
+    from app.models.models import Employee, EmploymentType, HakenAssignment, UkeoiAssignment
+
+    db_url = str(settings.DATABASE_URL).replace('+aiosqlite', '').replace('+asyncpg', '')
+    # One multi-row INSERT per 10k rows instead of one statement per row
+    engine = create_engine(db_url, insertmanyvalues_page_size=10_000)
+
+    ukeoi_numbers = {r['employee_number'] for r in ukeoi}
+    status_by_number = {r['employee_number']: r['status'] for r in haken + ukeoi if r.get('status')}
+
+    with engine.begin() as conn:
+        existing = set(conn.execute(select(Employee.employee_number)).scalars())
+
+        employees = []
+        for record in staff_master:
+            try:
+                number = int(record['employee_number'])
+            except (TypeError, ValueError):
+                continue
+            if number in existing:
+                continue
+            existing.add(number)
+            employees.append({
+                **{k: v for k, v in record.items() if k not in ('status', 'age')},
+                'employee_number': number,
+                'full_name': record.get('full_name') or f"Staff_{number}",
+                'status': status_by_number.get(record['employee_number'], '在職中'),
+                'employment_type': EmploymentType.UKEOI if record['employee_number'] in ukeoi_numbers else EmploymentType.HAKEN,
+            })
+
+        # Workers on the haken/ukeoi sheets but not in DBStaffX
+        from_assignments = 0
+        for employment_type, records in ((EmploymentType.HAKEN, haken), (EmploymentType.UKEOI, ukeoi)):
+            for record in records:
+                try:
+                    number = int(record['employee_number'])
+                except (TypeError, ValueError):
+                    continue
+                if number in existing:
+                    continue
+                existing.add(number)
+                from_assignments += 1
+                employees.append({
+                    **{k: v for k, v in record.items() if k != 'age'},
+                    'employee_number': number,
+                    'full_name': record.get('full_name') or f"Staff_{number}",
+                    'status': record.get('status') or '在職中',
+                    'hire_date': record.get('start_date'),
+                    'termination_date': record.get('end_date'),
+                    'employment_type': employment_type,
+                })
+
+        if employees:
+            rows = _table_rows(Employee.__table__, employees)
+            # executemany takes its column list from the first row, and the
+            # DBStaffX and assignment-sheet rows carry different keys
+            columns = set().union(*rows)
+            conn.execute(Employee.__table__.insert(), [{c: row.get(c) for c in columns} for row in rows])
+        print(f"Loaded {len(employees)} employees ({from_assignments} from assignment sheets only)")
+
+        # Resolve new employee ids for the assignment foreign keys
+        new_numbers = [e['employee_number'] for e in employees]
+        id_by_number = dict(conn.execute(
+            select(Employee.employee_number, Employee.id)
+            .where(Employee.employee_number.in_(new_numbers))
+        ).all()) if new_numbers else {}
+
+        for label, model, records in (('haken', HakenAssignment, haken), ('ukeoi', UkeoiAssignment, ukeoi)):
+            rows = []
+            assigned = set()
+            skipped = 0
+            for record in records:
+                try:
+                    employee_id = id_by_number.get(int(record['employee_number']))
+                except (TypeError, ValueError):
+                    skipped += 1
+                    continue
+                # Employees already in the database keep their assignments;
+                # one assignment per employee (employee_id is unique)
+                if employee_id is None or employee_id in assigned:
+                    skipped += 1
+                    continue
+                assigned.add(employee_id)
+                # 派遣先ID is a legacy id, not a client_companies key
+                fields = {k: v for k, v in record.items() if k != 'client_company_id'}
+                rows.extend(_table_rows(model.__table__, [fields], employee_id=employee_id))
+            if rows:
+                conn.execute(model.__table__.insert(), rows)
+            print(f"Loaded {len(rows)} {label} assignments (skipped {skipped})")
+
+    engine.dispose()
+
+
+def save_json(data: list, output_path: str, pretty: bool = False):
+    """Save extracted data to JSON file (compact unless pretty is set)."""
     Path(output_path).parent.mkdir(parents=True, exist_ok=True)
 
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2, default=str)
+    try:
+        import orjson
+    except ImportError:
+        orjson = None
+
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_PASSTHROUGH_DATETIME
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        with open(output_path, 'wb') as f:
+            f.write(orjson.dumps(data, default=str, option=option))
+    else:
+        with open(output_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2 if pretty else None, default=str)
 
     print(f"Saved {len(data)} records to: {output_path}")
 
@@ -277,28 +596,35 @@ def main():
     args = parse_args()
 
     print(f"Loading Excel file: {args.excel_file}")
-    wb = load_excel(args.excel_file)
+    sheets = extract_with_calamine(args.excel_file)
+    if sheets is None:
+        print("pandas/python-calamine not installed; falling back to openpyxl")
+        sheets = extract_sheets(args.excel_file, _openpyxl_sheet)
 
     output_dir = Path(args.output_dir)
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    # Extract and save DBStaffX
-    print("\nExtracting DBStaffX (Master Employee Data)...")
-    staff_master = extract_staff_master(wb)
+    # Save DBStaffX
+    print("\nDBStaffX (Master Employee Data)...")
+    staff_master = sheets['DBStaffX']
     print(f"Found {len(staff_master)} employees")
-    save_json(staff_master, str(output_dir / "staff_master.json"))
+    save_json(staff_master, str(output_dir / "staff_master.json"), pretty=args.pretty)
 
-    # Extract and save DBGenzaiX
-    print("\nExtracting DBGenzaiX (派遣社員)...")
-    haken = extract_haken(wb)
+    # Save DBGenzaiX
+    print("\nDBGenzaiX (派遣社員)...")
+    haken = sheets['DBGenzaiX']
     print(f"Found {len(haken)} dispatch workers")
-    save_json(haken, str(output_dir / "haken_assignments.json"))
+    save_json(haken, str(output_dir / "haken_assignments.json"), pretty=args.pretty)
 
-    # Extract and save DBUkeoiX
-    print("\nExtracting DBUkeoiX (請負社員)...")
-    ukeoi = extract_ukeoi(wb)
+    # Save DBUkeoiX
+    print("\nDBUkeoiX (請負社員)...")
+    ukeoi = sheets['DBUkeoiX']
     print(f"Found {len(ukeoi)} contract workers")
-    save_json(ukeoi, str(output_dir / "ukeoi_assignments.json"))
+    save_json(ukeoi, str(output_dir / "ukeoi_assignments.json"), pretty=args.pretty)
+
+    if args.load_into_db:
+        print("\nLoading extracted rows into database...")
+        load_into_db(staff_master, haken, ukeoi)
 
     print("\nMigration completed successfully!")
     print(f"Output directory: {output_dir}")
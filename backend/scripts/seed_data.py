@@ -3,6 +3,8 @@ Seed sample data for development and testing.
 
 Usage:
     python scripts/seed_data.py
+    SEED_BCRYPT_ROUNDS=4 python scripts/seed_data.py  # fast hashing for dev/test
+    SEED_RANDOM_SEED=42 python scripts/seed_data.py   # reproducible random fields
 
 This script creates sample data including:
 - Users with different roles
@@ -14,31 +16,38 @@ import asyncio
 import sys
 import os
 from datetime import date, timedelta
-import random
+
+import numpy as np
 
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-from sqlalchemy.orm import sessionmaker
-from passlib.context import CryptContext
+from sqlalchemy import insert, text
+import bcrypt
 
 from app.models.models import (
     User, UserRole, Candidate, CandidateStatus,
     ClientCompany, CompanyApartment
 )
-from app.core.config import settings
+from app.core.database import engine, async_session_maker
+
+
+# SEED_BCRYPT_ROUNDS=4 makes dev/test seeding near-instant
+BCRYPT_ROUNDS = int(os.getenv("SEED_BCRYPT_ROUNDS", "12"))
 
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+def hash_password(password: str) -> str:
+    """Hash a password using bcrypt directly."""
+    salt = bcrypt.gensalt(rounds=BCRYPT_ROUNDS)
+    return bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
 
 
-# Sample data
+# Sample data, keyed by column name so rows are insert-ready (enums as stored names)
 SAMPLE_USERS = [
-    {"username": "manager1", "email": "manager1@universal-kikaku.co.jp", "full_name": "山田 太郎", "role": UserRole.MANAGER},
-    {"username": "staff1", "email": "staff1@universal-kikaku.co.jp", "full_name": "佐藤 花子", "role": UserRole.STAFF},
-    {"username": "staff2", "email": "staff2@universal-kikaku.co.jp", "full_name": "鈴木 一郎", "role": UserRole.STAFF},
-    {"username": "viewer1", "email": "viewer1@universal-kikaku.co.jp", "full_name": "高橋 美香", "role": UserRole.VIEWER},
+    {"username": "manager1", "email": "manager1@universal-kikaku.co.jp", "full_name": "山田 太郎", "role": UserRole.MANAGER.name, "is_active": True},
+    {"username": "staff1", "email": "staff1@universal-kikaku.co.jp", "full_name": "佐藤 花子", "role": UserRole.STAFF.name, "is_active": True},
+    {"username": "staff2", "email": "staff2@universal-kikaku.co.jp", "full_name": "鈴木 一郎", "role": UserRole.STAFF.name, "is_active": True},
+    {"username": "viewer1", "email": "viewer1@universal-kikaku.co.jp", "full_name": "高橋 美香", "role": UserRole.VIEWER.name, "is_active": True},
 ]
 
 SAMPLE_CANDIDATES = [
@@ -53,100 +62,147 @@ SAMPLE_CANDIDATES = [
 ]
 
 SAMPLE_COMPANIES = [
-    {"name": "株式会社トヨタ自動車", "name_kana": "カブシキガイシャトヨタジドウシャ", "address": "愛知県豊田市トヨタ町1番地", "contact_person": "製造部 田中"},
-    {"name": "株式会社デンソー", "name_kana": "カブシキガイシャデンソー", "address": "愛知県刈谷市昭和町1-1", "contact_person": "人事部 山本"},
-    {"name": "アイシン精機株式会社", "name_kana": "アイシンセイキカブシキガイシャ", "address": "愛知県刈谷市朝日町2-1", "contact_person": "総務部 伊藤"},
-    {"name": "株式会社豊田自動織機", "name_kana": "カブシキガイシャトヨタジドウショッキ", "address": "愛知県刈谷市豊田町2-1", "contact_person": "製造課 小林"},
-    {"name": "ジェイテクト株式会社", "name_kana": "ジェイテクトカブシキガイシャ", "address": "愛知県刈谷市朝日町1-1", "contact_person": "業務部 渡辺"},
+    {"name": "株式会社トヨタ自動車", "name_kana": "カブシキガイシャトヨタジドウシャ", "address": "愛知県豊田市トヨタ町1番地", "contact_person": "製造部 田中", "is_active": True},
+    {"name": "株式会社デンソー", "name_kana": "カブシキガイシャデンソー", "address": "愛知県刈谷市昭和町1-1", "contact_person": "人事部 山本", "is_active": True},
+    {"name": "アイシン精機株式会社", "name_kana": "アイシンセイキカブシキガイシャ", "address": "愛知県刈谷市朝日町2-1", "contact_person": "総務部 伊藤", "is_active": True},
+    {"name": "株式会社豊田自動織機", "name_kana": "カブシキガイシャトヨタジドウショッキ", "address": "愛知県刈谷市豊田町2-1", "contact_person": "製造課 小林", "is_active": True},
+    {"name": "ジェイテクト株式会社", "name_kana": "ジェイテクトカブシキガイシャ", "address": "愛知県刈谷市朝日町1-1", "contact_person": "業務部 渡辺", "is_active": True},
 ]
 
 SAMPLE_APARTMENTS = [
-    {"name": "ユニバーサル寮A棟", "address": "愛知県安城市三河安城町1-1-1", "capacity": 8, "monthly_rent": 25000},
-    {"name": "ユニバーサル寮B棟", "address": "愛知県安城市三河安城町1-1-2", "capacity": 6, "monthly_rent": 28000},
-    {"name": "刈谷社宅", "address": "愛知県刈谷市東境町2-2-2", "capacity": 4, "monthly_rent": 30000},
-    {"name": "豊田寮", "address": "愛知県豊田市若林西町3-3-3", "capacity": 10, "monthly_rent": 22000},
+    {"name": "ユニバーサル寮A棟", "address": "愛知県安城市三河安城町1-1-1", "capacity": 8, "monthly_rent": 25000, "is_active": True},
+    {"name": "ユニバーサル寮B棟", "address": "愛知県安城市三河安城町1-1-2", "capacity": 6, "monthly_rent": 28000, "is_active": True},
+    {"name": "刈谷社宅", "address": "愛知県刈谷市東境町2-2-2", "capacity": 4, "monthly_rent": 30000, "is_active": True},
+    {"name": "豊田寮", "address": "愛知県豊田市若林西町3-3-3", "capacity": 10, "monthly_rent": 22000, "is_active": True},
 ]
 
 
+# Built once so each table's statement compiles once and hits the cache after
+USER_INSERT = insert(User.__table__)
+CANDIDATE_INSERT = insert(Candidate.__table__)
+COMPANY_INSERT = insert(ClientCompany.__table__)
+APARTMENT_INSERT = insert(CompanyApartment.__table__)
+
+
+async def bulk_insert(session, stmt, rows):
+    """Insert rows with COPY on asyncpg, or execute the multi-row INSERT elsewhere."""
+    conn = await session.connection()
+    if conn.dialect.driver != "asyncpg":
+        await session.execute(stmt, rows)
+        return
+
+    table = stmt.table
+
+    # COPY bypasses SQLAlchemy types, so apply their bind processing
+    # (e.g. enum members -> labels) before handing tuples to asyncpg
+    columns = list(rows[0])
+    processors = [
+        table.c[name].type.dialect_impl(conn.dialect).bind_processor(conn.dialect)
+        for name in columns
+    ]
+    records = [
+        tuple(proc(row[name]) if proc else row[name] for name, proc in zip(columns, processors))
+        for row in rows
+    ]
+    # The asyncpg adapter opens its transaction lazily on the first execute;
+    # run one statement first so the COPY below joins the session's
+    # transaction instead of autocommitting outside it
+    await conn.execute(text("SELECT 1"))
+    raw = await conn.get_raw_connection()
+    await raw.driver_connection.copy_records_to_table(
+        table.name, records=records, columns=columns, schema_name=table.schema
+    )
+
+
 async def seed_data():
     """Seed sample data."""
 
-    engine = create_async_engine(settings.DATABASE_URL, echo=False)
-    async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
-
-    async with async_session() as session:
-        # Create sample users
-        print("Creating sample users...")
-        for user_data in SAMPLE_USERS:
-            user = User(
-                username=user_data["username"],
-                email=user_data["email"],
-                hashed_password=pwd_context.hash("Password123!"),
-                full_name=user_data["full_name"],
-                role=user_data["role"],
-                is_active=True,
-            )
-            session.add(user)
-
-        # Create sample candidates
-        print("Creating sample candidates...")
-        statuses = [CandidateStatus.REGISTERED, CandidateStatus.PRESENTED, CandidateStatus.ACCEPTED]
-        for i, cand_data in enumerate(SAMPLE_CANDIDATES):
-            candidate = Candidate(
-                full_name=cand_data["full_name"],
-                name_kana=cand_data["name_kana"],
-                nationality=cand_data["nationality"],
-                gender=cand_data["gender"],
-                birth_date=date(1985 + i, random.randint(1, 12), random.randint(1, 28)),
-                visa_type=cand_data["visa_type"],
-                visa_expiry=date.today() + timedelta(days=random.randint(180, 730)) if cand_data["visa_type"] else None,
-                japanese_level=cand_data["japanese_level"],
-                status=random.choice(statuses),
-                phone=f"090-{random.randint(1000, 9999)}-{random.randint(1000, 9999)}",
-                postal_code=f"{random.randint(100, 999)}-{random.randint(1000, 9999)}",
-                address="愛知県名古屋市中村区" + f"○○町{random.randint(1, 10)}-{random.randint(1, 30)}",
-            )
-            session.add(candidate)
-
-        # Create sample companies
-        print("Creating sample client companies...")
-        for comp_data in SAMPLE_COMPANIES:
-            company = ClientCompany(
-                name=comp_data["name"],
-                name_kana=comp_data["name_kana"],
-                address=comp_data["address"],
-                contact_person=comp_data["contact_person"],
-                phone=f"0566-{random.randint(10, 99)}-{random.randint(1000, 9999)}",
-                billing_rate_default=random.randint(1800, 2500),
-                is_active=True,
-            )
-            session.add(company)
-
-        # Create sample apartments
-        print("Creating sample apartments...")
-        for apt_data in SAMPLE_APARTMENTS:
-            apartment = CompanyApartment(
-                name=apt_data["name"],
-                address=apt_data["address"],
-                capacity=apt_data["capacity"],
-                current_occupants=random.randint(0, apt_data["capacity"]),
-                monthly_rent=apt_data["monthly_rent"],
-                is_active=True,
-            )
-            session.add(apartment)
-
-        await session.commit()
-
-        print("\n" + "=" * 50)
-        print("Sample data created successfully!")
-        print("=" * 50)
-        print(f"Users: {len(SAMPLE_USERS)}")
-        print(f"Candidates: {len(SAMPLE_CANDIDATES)}")
-        print(f"Client Companies: {len(SAMPLE_COMPANIES)}")
-        print(f"Apartments: {len(SAMPLE_APARTMENTS)}")
-        print("=" * 50)
-        print("\nAll users have password: Password123!")
-        print("=" * 50 + "\n")
+    # Random columns are drawn as arrays per table; SEED_RANDOM_SEED makes them reproducible
+    seed = os.getenv("SEED_RANDOM_SEED")
+    rng = np.random.default_rng(int(seed) if seed else None)
+
+    print("Preparing sample users...")
+    # Every sample user shares one password, so hash it once, off the event loop
+    password_hash = await asyncio.to_thread(hash_password, "Password123!")
+    users = [{**user_data, "password_hash": password_hash} for user_data in SAMPLE_USERS]
+
+    print("Preparing sample candidates...")
+    # Enum columns store member names; pass those so binding is a plain string check
+    statuses = [status.name for status in (CandidateStatus.REGISTERED, CandidateStatus.PRESENTED, CandidateStatus.ACCEPTED)]
+    n = len(SAMPLE_CANDIDATES)
+    months = rng.integers(1, 13, size=n).tolist()
+    days = rng.integers(1, 29, size=n).tolist()
+    visa_days = rng.integers(180, 731, size=n).tolist()
+    status_idx = rng.integers(0, len(statuses), size=n).tolist()
+    phones = [
+        f"090-{a}-{b}"
+        for a, b in zip(rng.integers(1000, 10000, size=n).tolist(), rng.integers(1000, 10000, size=n).tolist())
+    ]
+    postal_codes = [
+        f"{a}-{b}"
+        for a, b in zip(rng.integers(100, 1000, size=n).tolist(), rng.integers(1000, 10000, size=n).tolist())
+    ]
+    addresses = [
+        f"愛知県名古屋市中村区○○町{block}-{lot}"
+        for block, lot in zip(rng.integers(1, 11, size=n).tolist(), rng.integers(1, 31, size=n).tolist())
+    ]
+    today = date.today()
+    candidates = [
+        {
+            **cand_data,
+            "birth_date": date(1985 + i, months[i], days[i]),
+            "visa_expiry": today + timedelta(days=visa_days[i]) if cand_data["visa_type"] else None,
+            "status": statuses[status_idx[i]],
+            "phone": phones[i],
+            "postal_code": postal_codes[i],
+            "address": addresses[i],
+        }
+        for i, cand_data in enumerate(SAMPLE_CANDIDATES)
+    ]
+
+    print("Preparing sample client companies...")
+    n = len(SAMPLE_COMPANIES)
+    phones = [
+        f"0566-{a}-{b}"
+        for a, b in zip(rng.integers(10, 100, size=n).tolist(), rng.integers(1000, 10000, size=n).tolist())
+    ]
+    billing_rates = rng.integers(1800, 2501, size=n).tolist()
+    companies = [
+        {
+            **comp_data,
+            "phone": phones[i],
+            "billing_rate_default": billing_rates[i],
+        }
+        for i, comp_data in enumerate(SAMPLE_COMPANIES)
+    ]
+
+    print("Preparing sample apartments...")
+    capacities = np.array([apt_data["capacity"] for apt_data in SAMPLE_APARTMENTS])
+    occupants = rng.integers(0, capacities + 1).tolist()
+    apartments = [
+        {**apt_data, "current_occupants": occupants[i]}
+        for i, apt_data in enumerate(SAMPLE_APARTMENTS)
+    ]
+
+    # All four tables in one transaction on one connection, so a failure
+    # leaves nothing half-seeded
+    print("Inserting sample data...")
+    async with async_session_maker() as session, session.begin():
+        await bulk_insert(session, USER_INSERT, users)
+        await bulk_insert(session, CANDIDATE_INSERT, candidates)
+        await bulk_insert(session, COMPANY_INSERT, companies)
+        await bulk_insert(session, APARTMENT_INSERT, apartments)
+
+    print("\n" + "=" * 50)
+    print("Sample data created successfully!")
+    print("=" * 50)
+    print(f"Users: {len(SAMPLE_USERS)}")
+    print(f"Candidates: {len(SAMPLE_CANDIDATES)}")
+    print(f"Client Companies: {len(SAMPLE_COMPANIES)}")
+    print(f"Apartments: {len(SAMPLE_APARTMENTS)}")
+    print("=" * 50)
+    print("\nAll users have password: Password123!")
+    print("=" * 50 + "\n")
 
 
 async def main():
@@ -158,6 +214,8 @@ async def main():
         import traceback
         traceback.print_exc()
         sys.exit(1)
+    finally:
+        await engine.dispose()
 
 
 if __name__ == "__main__":
@@ -5,72 +5,112 @@ import os
 
 load_dotenv()
 
-from app.core.database import init_db, async_session_maker
+from app.core.database import engine, init_db, async_session_maker
 from app.models.models import User, UserRole, Candidate, CandidateStatus, EmploymentType, JoiningNotice, JoiningNoticeStatus
 from app.core.security import get_password_hash
-from sqlalchemy import select
+from sqlalchemy import insert, inspect, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from datetime import date
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+def insert_or_ignore(model):
+    """Dialect-specific insert() that supports on_conflict_do_nothing()."""
+    if engine.dialect.name == "postgresql":
+        return pg_insert(model)
+    return sqlite_insert(model)
+
+
+# Built once so each statement compiles once and hits the cache after
+ADMIN_INSERT = (
+    insert_or_ignore(User.__table__)
+    .on_conflict_do_nothing(index_elements=["username"])
+    .returning(User.__table__.c.id)
+)
+CANDIDATE_INSERT = insert(Candidate.__table__)
+
+
+async def schema_exists() -> bool:
+    """Check for the users table with a single lightweight query."""
+    async with engine.connect() as conn:
+        return await conn.run_sync(lambda sync_conn: inspect(sync_conn).has_table(User.__tablename__))
+
+
 async def seed_data():
-    logger.info("Initializing database...")
-    await init_db()
-    
-    async with async_session_maker() as session:
-        # Check if admin exists
-        result = await session.execute(select(User).where(User.username == "admin"))
-        admin = result.scalar_one_or_none()
-        
-        if not admin:
-            logger.info("Creating admin user...")
-            admin_user = User(
-                username="admin",
-                email="admin@example.com",
-                password_hash=get_password_hash("admin"),
-                role=UserRole.SUPER_ADMIN,
-                full_name="System Administrator",
-                is_active=True
-            )
-            session.add(admin_user)
-            await session.commit()
-            logger.info("Admin user created (admin/admin)")
+    # Schema is normally managed by Alembic; only create it when missing or forced
+    if os.getenv("SEED_INIT_DB") == "1" or not await schema_exists():
+        logger.info("Initializing database...")
+        await init_db()
+
+    # bcrypt is CPU-bound; hash in a worker thread so the event loop stays free
+    admin_hash = await asyncio.to_thread(get_password_hash, "admin")
+
+    # One transaction for the whole seed; commits on exit, rolls back on error
+    async with async_session_maker() as session, session.begin():
+        # Create admin unless the username is taken (the unique index decides),
+        # returning the new id in the same round-trip
+        result = await session.execute(ADMIN_INSERT, {
+            "username": "admin",
+            "email": "admin@example.com",
+            "password_hash": admin_hash,
+            "role": UserRole.SUPER_ADMIN.name,
+            "full_name": "System Administrator",
+            "is_active": True,
+        })
+        admin_id = result.scalar_one_or_none()
+        if admin_id is not None:
+            logger.info(f"Admin user created (admin/admin), id={admin_id}")
         else:
             logger.info("Admin user already exists")
 
         # Create some dummy data for dashboard
         logger.info("Creating dummy data...")
-        
-        # Candidate 1
-        result = await session.execute(select(Candidate).where(Candidate.full_name == "山田 太郎"))
-        if not result.scalar_one_or_none():
-            candidate1 = Candidate(
-                full_name="山田 太郎",
-                name_kana="ヤマダ タロウ",
-                status=CandidateStatus.REGISTERED,
-                gender="Male",
-                birth_date=date(1990, 1, 1),
-                created_by=1
-            )
-            session.add(candidate1)
-        
-        # Candidate 2 (Hired)
-        result = await session.execute(select(Candidate).where(Candidate.full_name == "佐藤 花子"))
-        if not result.scalar_one_or_none():
-            candidate2 = Candidate(
-                full_name="佐藤 花子",
-                name_kana="サトウ ハナコ",
-                status=CandidateStatus.HIRED,
-                 gender="Female",
-                birth_date=date(1995, 5, 5),
-                created_by=1
-            )
-            session.add(candidate2)
-
-        await session.commit()
-        logger.info("Seeding completed!")
+
+        sample_candidates = [
+            {
+                "full_name": "山田 太郎",
+                "name_kana": "ヤマダ タロウ",
+                "status": CandidateStatus.REGISTERED.name,
+                "gender": "Male",
+                "birth_date": date(1990, 1, 1),
+                "created_by": 1,
+            },
+            # Hired
+            {
+                "full_name": "佐藤 花子",
+                "name_kana": "サトウ ハナコ",
+                "status": CandidateStatus.HIRED.name,
+                "gender": "Female",
+                "birth_date": date(1995, 5, 5),
+                "created_by": 1,
+            },
+        ]
+
+        # full_name isn't unique, so check all sample names in one query
+        result = await session.execute(
+            select(Candidate.full_name)
+            .where(Candidate.full_name.in_([c["full_name"] for c in sample_candidates]))
+        )
+        existing = set(result.scalars())
+        candidates = [c for c in sample_candidates if c["full_name"] not in existing]
+
+        # One multi-row INSERT for all missing candidates
+        if candidates:
+            await session.execute(CANDIDATE_INSERT, candidates)
+
+    logger.info("Seeding completed!")
+
+
+async def main():
+    try:
+        await seed_data()
+    finally:
+        # Close the pooled connection so nothing outlives the seed
+        await engine.dispose()
+
 
 if __name__ == "__main__":
-    asyncio.run(seed_data())
+    asyncio.run(main())